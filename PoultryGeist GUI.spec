@@ -5,12 +5,14 @@ a = Analysis(
     ['gui_main.py'],
     pathex=[],
     binaries=[],
-    datas=[],
-    hiddenimports=[],
+    datas=[('rules.json', '.')],
+    # Loaded on first use by gui_main, so the analysis can't see them
+    hiddenimports=['tkinter.messagebox', 'tkinter.simpledialog', 'savegame', 'simulate', 'solver'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # Only the simulation tools use NumPy (blockrng); keep the bundle small
+    excludes=['numpy', 'blockrng', 'unittest', 'pydoc', 'doctest'],
     noarchive=False,
     optimize=0,
 )
@@ -5,12 +5,13 @@ a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('rules.json', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # The console game never loads Tk or NumPy; keep the bundle small
+    excludes=['tkinter', '_tkinter', 'numpy', 'blockrng', 'unittest', 'pydoc', 'doctest'],
     noarchive=False,
     optimize=0,
 )
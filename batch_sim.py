@@ -0,0 +1,216 @@
+"""Vectorized turn pipeline for running many independent farms at once.
+
+Each farm is one column in a set of NumPy arrays: resources are (N,) vectors
+and the flock, ghosts and graveyard are (3, N) count matrices, one contiguous
+row per breed or tier. A call to ``step()`` applies the same rules as ``end_turn`` in main.py to
+every farm in lockstep.
+"""
+
+import numpy as np
+
+import main as engine
+from main import INITIAL_CASH, INITIAL_FEED, INITIAL_CHICKENS, TURNS_PER_SEASON, RULES, GameState, Chicken, Flock
+
+# --- Rule Tables ---
+# NumPy copies of the compiled ruleset, indexed the same way
+TIERS = list(RULES.tiers)
+BREEDS = list(RULES.breeds)
+SEASON_NAMES = list(RULES.season_names)
+BRONZE, SILVER, GOLD = range(3)
+
+BREED_TIER = np.array([TIERS.index(tier) for tier in RULES.breed_tier])
+BREED_EGGS = np.array(RULES.breed_eggs)
+BREED_FEED = np.array(RULES.breed_feed)
+BREED_HEALTH = np.array(RULES.breed_health)
+# lose_chicken takes the lowest-health bird. Every bird gets the same Gold ghost
+# buff, so ordering by base health is enough; ties fall back to breed order.
+WEAKEST_ORDER = np.argsort(BREED_HEALTH, kind="stable")
+LEGHORN = BREEDS.index("Pearl Leghorn")
+
+SEASON_EGG_DELTA = np.array(RULES.season_egg_delta)
+SEASON_FEED_MULTIPLIER = np.array(RULES.season_feed_multiplier)
+SEASON_ILLNESS = np.array(RULES.season_illness_chance)
+COOP_CAPACITY = np.zeros(max(RULES.coop_capacity) + 1, dtype=np.int32)
+for level, capacity in RULES.coop_capacity.items():
+    COOP_CAPACITY[level] = capacity
+
+# Event effects the batch applies in start_turn, by code. Handlers registered
+# later with main.event_effect run arbitrary Python per farm and can't be
+# vectorized here.
+EFFECTS = ["lose_chicken", "gain_chicken", "cash_bonus", "feed_bonus", "double_egg_value"]
+LOSE_CHICKEN, GAIN_CHICKEN, CASH_BONUS, FEED_BONUS, DOUBLE_EGG_VALUE = range(len(EFFECTS))
+
+
+class UnsupportedEffect(ValueError):
+    pass
+
+
+def event_tables(ruleset):
+    # Effect code per event and per-season alias tables, as in
+    # Ruleset.draw_event. Built from the ruleset as it is now, so events added
+    # with add_event are included.
+    effects = []
+    for name, event in ruleset.event_items:
+        if event["effect"] not in EFFECTS:
+            raise UnsupportedEffect(f"event {name!r} uses effect {event['effect']!r}, which batch_sim "
+                                    f"cannot vectorize; supported effects are {EFFECTS}")
+        effects.append(EFFECTS.index(event["effect"]))
+    seasons = len(ruleset.season_names)
+    has_events = np.array([table is not None for table in ruleset.season_event_tables])
+    probability = np.ones((seasons, max(1, len(effects))))
+    alias = np.zeros((seasons, max(1, len(effects))), dtype=np.intp)
+    for season, table in enumerate(ruleset.season_event_tables):
+        if table is not None:
+            probability[season], alias[season] = table
+    return np.array(effects or [0], dtype=np.intp), has_events, probability, alias
+
+
+class BatchFarms:
+    def __init__(self, n, seed=None):
+        self.n = n
+        self.rng = np.random.default_rng(seed)
+        self.event_chance = engine.EVENT_CHANCE
+        self.event_effect, self.season_has_events, self.event_probability, self.event_alias = event_tables(engine.RULES)
+        self.cash = np.full(n, float(INITIAL_CASH))
+        self.banked_cash = np.zeros(n, dtype=np.int32)
+        self.feed = np.full(n, INITIAL_FEED, dtype=np.int32)
+        self.eggs = np.zeros(n, dtype=np.int32)
+        self.meat = np.zeros(n, dtype=np.int32)
+        self.meat_harvested_this_year = np.zeros(n, dtype=np.int32)
+        self.coop_level = np.ones(n, dtype=np.int32)
+        self.turn = np.ones(n, dtype=np.int32)
+        self.year = np.ones(n, dtype=np.int32)
+        self.season = np.zeros(n, dtype=np.int32)
+        self.double_eggs_active = np.zeros(n, dtype=bool)
+        self.egg_price_multiplier = np.ones(n)
+        self.eggs_this_turn = np.zeros(n, dtype=np.int32)
+        self.flock = np.zeros((len(BREEDS), n), dtype=np.int32)
+        self.ghosts = np.zeros((len(TIERS), n), dtype=np.int32)
+        self.graveyard = np.zeros((len(TIERS), n), dtype=np.int32)
+        for c in INITIAL_CHICKENS:
+            self.flock[BREEDS.index(c["breed"])] += 1
+
+    @classmethod
+    def from_states(cls, states, seed=None):
+        farms = cls(len(states), seed)
+        for i, state in enumerate(states):
+            farms.cash[i] = state.cash
+            farms.banked_cash[i] = state.banked_cash
+            farms.feed[i] = state.feed
+            farms.eggs[i] = state.eggs
+            farms.meat[i] = state.meat
+            farms.meat_harvested_this_year[i] = state.meat_harvested_this_year
+            farms.coop_level[i] = state.coop_level
+            farms.turn[i] = state.turn
+            farms.year[i] = state.year
+            farms.season[i] = state.season_index
+            farms.double_eggs_active[i] = state.double_eggs_active
+            farms.egg_price_multiplier[i] = state.egg_price_multiplier
+            farms.eggs_this_turn[i] = state.eggs_this_turn
+            farms.flock[:, i] = [sum(1 for c in state.chickens if c.breed == b) for b in BREEDS]
+            farms.ghosts[:, i] = [state.ghost_counts[t] for t in TIERS]
+            farms.graveyard[:, i] = [state.graveyard_counts[t] for t in TIERS]
+        return farms
+
+    def to_state(self, i):
+        # Rebuild one farm as a GameState, e.g. to inspect it in the console
+        state = GameState()
+        state.cash = float(self.cash[i])
+        state.banked_cash = int(self.banked_cash[i])
+        state.feed = int(self.feed[i])
+        state.eggs = int(self.eggs[i])
+        state.meat = int(self.meat[i])
+        state.meat_harvested_this_year = int(self.meat_harvested_this_year[i])
+        state.coop_level = int(self.coop_level[i])
+        state.turn = int(self.turn[i])
+        state.year = int(self.year[i])
+        state.season_index = int(self.season[i])
+        state.double_eggs_active = bool(self.double_eggs_active[i])
+        state.egg_price_multiplier = float(self.egg_price_multiplier[i])
+        state.eggs_this_turn = int(self.eggs_this_turn[i])
+        state.chickens = Flock()
+        for b, breed in enumerate(BREEDS):
+            for _ in range(self.flock[b, i]):
+                state.chickens.append(Chicken(breed, RULES.breed_tier[b]))
+        for t, tier in enumerate(TIERS):
+            state.graveyard[tier] = int(self.graveyard[t, i])
+            state.add_ghost(tier, int(self.ghosts[t, i]))
+        return state
+
+    def flock_size(self):
+        return self.flock.sum(axis=0)
+
+    def lose_chicken(self, mask):
+        # Vectorized lose_chicken: a Bronze ghost shields the flock, otherwise
+        # the weakest bird goes to the graveyard.
+        mask = mask & (self.flock_size() > 0)
+        shielded = mask & (self.ghosts[BRONZE] > 0)
+        self.ghosts[BRONZE] -= shielded
+        dying = mask & ~shielded
+        for b in WEAKEST_ORDER:
+            dies = dying & (self.flock[b] > 0)
+            self.flock[b] -= dies
+            self.graveyard[BREED_TIER[b]] += dies
+            dying &= ~dies
+
+    def start_turn(self):
+        # Mirrors process_turn_start; the Gold ghost health buff only matters
+        # for ordering, which WEAKEST_ORDER already accounts for.
+        self.egg_price_multiplier[:] = 1.0
+
+        rolled = (self.rng.random(self.n) < self.event_chance) & self.season_has_events[self.season]
+        x = self.rng.random(self.n) * self.event_probability.shape[1]
+        column = x.astype(np.intp)
+        keep = (x - column) < self.event_probability[self.season, column]
+        effect = self.event_effect[np.where(keep, column, self.event_alias[self.season, column])]
+        self.lose_chicken(rolled & (effect == LOSE_CHICKEN))
+        hatched = rolled & (effect == GAIN_CHICKEN) & (self.flock_size() < COOP_CAPACITY[self.coop_level])
+        self.flock[LEGHORN] += hatched
+        self.cash[rolled & (effect == CASH_BONUS)] += 10
+        self.feed[rolled & (effect == FEED_BONUS)] += 10
+        self.egg_price_multiplier[rolled & (effect == DOUBLE_EGG_VALUE)] = 2.0
+
+        egg_multiplier = np.where(self.double_eggs_active, 2.0, 1.0) + SEASON_EGG_DELTA[self.season]
+        base_eggs = np.zeros(self.n, dtype=np.int32)
+        for b in range(len(BREEDS)):
+            base_eggs += self.flock[b] * BREED_EGGS[b]
+            if BREED_TIER[b] == BRONZE:
+                base_eggs += self.flock[b] * self.ghosts[BRONZE]
+        new_eggs = (base_eggs * egg_multiplier).astype(np.int32)
+        self.eggs += new_eggs
+        self.eggs_this_turn = new_eggs
+        self.double_eggs_active[:] = False
+        return new_eggs
+
+    def end_turn(self):
+        # Feed and illness phase of end_turn, followed by GameState.next_turn
+        feed_multiplier = SEASON_FEED_MULTIPLIER[self.season]
+        feed_needed = np.zeros(self.n, dtype=np.int32)
+        for b in range(len(BREEDS)):
+            consumption = BREED_FEED[b]
+            if BREED_TIER[b] == SILVER:
+                consumption = np.maximum(0, consumption - self.ghosts[SILVER])
+            feed_needed += self.flock[b] * (consumption * feed_multiplier).astype(np.int32)
+        fed = self.feed >= feed_needed
+        self.feed -= np.where(fed, feed_needed, 0)
+        self.lose_chicken(~fed)
+
+        ill = self.rng.random(self.n) < SEASON_ILLNESS[self.season]
+        self.lose_chicken(ill)
+
+        self.turn += 1
+        rollover = (self.turn - 1) % TURNS_PER_SEASON == 0
+        new_year = rollover & (self.season == len(SEASON_NAMES) - 1)
+        self.season[rollover] = (self.season[rollover] + 1) % len(SEASON_NAMES)
+        self.year[new_year] += 1
+        self.meat_harvested_this_year[new_year] = 0
+
+    def step(self):
+        # Same as main.end_turn: finish this turn, then start the next one
+        self.end_turn()
+        return self.start_turn()
+
+    def run(self, turns):
+        for _ in range(turns):
+            self.step()
+        return self
@@ -0,0 +1,289 @@
+"""Benchmarks for the turn pipeline and the front-ends.
+
+Everything runs offline from fixed seeds and the results are printed as JSON,
+so runs can be diffed between releases of the rules:
+
+    python bench.py --output bench.json
+    python bench.py --quick
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+
+import main as console
+from main import (
+    CHICKEN_STATS, GameState, Chicken, process_turn_start, end_turn,
+    lose_chicken, exchange_ghost, GHOST_EXCHANGE_RATES
+)
+from savegame import encode_state, decode_state, encode_entry
+from screen import Screen
+from server import GameServer
+from sessionstore import SessionStore, estimate_state_bytes
+from simulate import run_game
+
+SEED = 1234
+FLOCK_SIZES = (5, 15, 1000, 100000)
+DISPLAY_FLOCK_SIZES = (5, 15, 1000, 10000)
+
+def timed(fn, ops):
+    # Runs fn() `ops` times; returns the usual per-op figures
+    ops = max(1, int(ops))
+    start = time.perf_counter()
+    for _ in range(ops):
+        fn()
+    seconds = time.perf_counter() - start
+    return {
+        "ops": ops,
+        "seconds": seconds,
+        "per_sec": ops / seconds if seconds else None,
+        "us_per_op": seconds / ops * 1e6,
+    }
+
+def farm_with_flock(size, seed=SEED):
+    # A farm with `size` birds of mixed breeds, ignoring coop capacity
+    rng = random.Random(seed)
+    state = GameState(random.Random(seed))
+    breeds = list(CHICKEN_STATS)
+    for _ in range(size - len(state.chickens)):
+        breed = rng.choice(breeds)
+        state.chickens.append(Chicken(breed, CHICKEN_STATS[breed]["tier"]))
+    state.feed = 10 ** 9
+    return state
+
+def bench_turn_pipeline(scale):
+    state = farm_with_flock(5)
+    results = {
+        "process_turn_start": timed(lambda: process_turn_start(state), 20000 * scale),
+        "GameState.next_turn": timed(state.next_turn, 200000 * scale),
+    }
+    state = farm_with_flock(5)
+    results["end_turn"] = timed(lambda: end_turn(state), 20000 * scale)
+    return results
+
+def bench_games(scale):
+    seeds = iter(range(10 ** 9))
+    return {"run_game (greedy policy)": timed(lambda: run_game(SEED + next(seeds)), 50 * scale)}
+
+def bench_flock_ops(scale):
+    results = {}
+    for size in FLOCK_SIZES:
+        state = farm_with_flock(size)
+        messages = []
+
+        def lose_and_replace():
+            # Re-add a bird so the flock stays at `size`
+            lose_chicken(state, messages)
+            state.chickens.append(Chicken("Pearl Leghorn", "Bronze"))
+            messages.clear()
+
+        results[f"lose_chicken[{size}]"] = timed(lose_and_replace, 2000 * scale)
+
+        state.graveyard["Bronze"] = size
+        rate = GHOST_EXCHANGE_RATES["Bronze"]
+
+        def exchange_and_refill():
+            exchange_ghost(state, "Bronze")
+            state.graveyard["Bronze"] += rate
+
+        results[f"exchange_ghost[{size}]"] = timed(exchange_and_refill, 2000 * scale)
+    return results
+
+def bench_saves(scale):
+    results = {}
+    for size in FLOCK_SIZES:
+        state = farm_with_flock(size)
+        state.graveyard["Bronze"] = 10 ** 9  # the ledger size doesn't matter
+        data = encode_state(state)
+        ops = max(1, 2000 * scale // size)
+        results[f"save[{size}]"] = dict(timed(lambda: encode_state(state), ops), bytes=len(data))
+        results[f"load[{size}]"] = timed(lambda: decode_state(data, random.Random()), ops)
+    results["journal_entry"] = timed(lambda: encode_entry(("sell_eggs", 4), [0.5, 0.25]), 100000 * scale)
+    return results
+
+class TerminalBuffer(io.StringIO):
+    # Collects what the console renderer writes, posing as a terminal
+    def isatty(self):
+        return True
+
+def bench_console(scale):
+    results = {}
+    screen, console.SCREEN = console.SCREEN, Screen(TerminalBuffer())
+    try:
+        for size in DISPLAY_FLOCK_SIZES:
+            state = farm_with_flock(size)
+            messages = end_turn(state)
+
+            def redraw():
+                # One resource changes per frame, as after a typical action
+                state.eggs += 1
+                console.display_game_state(state, messages, console.ACTION_MENU)
+                console.SCREEN.stream.seek(0)
+                console.SCREEN.stream.truncate()
+
+            results[f"display_game_state[{size}]"] = timed(redraw, 2000 * scale)
+    finally:
+        console.SCREEN = screen
+    return results
+
+async def _server_round_trips(clients, turns):
+    # `clients` connections play `turns` turns each against one server in
+    # this event loop; returns every request's round-trip time
+    server = await GameServer().serve(port=0)
+    port = server.sockets[0].getsockname()[1]
+    latencies = []
+
+    async def play(seed):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        async def request(body):
+            start = time.perf_counter()
+            writer.write(json.dumps(body).encode() + b"\n")
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - start)
+            return response
+
+        response = await request({"op": "new", "seed": seed})
+        session = response["session"]
+        for _ in range(turns):
+            await request({"op": "act", "session": session, "action": ["sell_eggs", response["state"]["eggs"]]})
+            response = await request({"op": "act", "session": session, "action": ["end_turn"]})
+            if "outcome" in response:
+                break
+        writer.close()
+
+    async with server:
+        await asyncio.gather(*(play(SEED + i) for i in range(clients)))
+    return latencies
+
+def bench_server(scale):
+    # Clients and server share one core here, so latencies are an upper bound
+    results = {}
+    for clients in (10, 1000):
+        start = time.perf_counter()
+        latencies = sorted(asyncio.run(_server_round_trips(clients, max(1, int(10 * scale)))))
+        seconds = time.perf_counter() - start
+        results[f"server[{clients} clients]"] = {
+            "requests": len(latencies),
+            "per_sec": len(latencies) / seconds,
+            "p50_ms": latencies[len(latencies) // 2] * 1e3,
+            "p99_ms": latencies[int(len(latencies) * 0.99)] * 1e3,
+        }
+    return results
+
+def bench_session_store(scale):
+    state = farm_with_flock(15)
+    size = estimate_state_bytes(state)
+    results = {}
+    store = SessionStore(budget=size * 1000)
+    try:
+        for i in range(1000):
+            store.put(i, GameState.from_snapshot(state.snapshot(), random.Random(i)))
+        ids = iter(range(10 ** 9))
+        results["session_store.get[hit]"] = timed(lambda: store.get(next(ids) % 1000), 100000 * scale)
+
+        # Half the farms fit, and a round-robin sweep misses on every lookup
+        store.budget = size * 500
+        store.evict()
+        results["session_store.get[miss]"] = timed(lambda: store.get(next(ids) % 1000), 2000 * scale)
+        results["session_store.get[miss]"]["stats"] = store.stats()
+    finally:
+        store.close()
+    return results
+
+def bench_startup(scale):
+    # Cold imports of each front-end in a fresh interpreter, startup included
+    results = {}
+    for module in ("main", "gui_main"):
+        command = [sys.executable, "-c", f"import {module}"]
+        if subprocess.run(command, capture_output=True).returncode != 0:
+            results[f"import[{module}]"] = {"skipped": f"{module} does not import here"}
+            continue
+        results[f"import[{module}]"] = timed(lambda: subprocess.run(command, check=True), 20 * scale)
+    return results
+
+def bench_gui(scale):
+    try:
+        import tkinter as tk
+        from gui_main import PoultryGeistGUI
+        root = tk.Tk()
+    except Exception as e:  # no Tk or no display on this machine
+        return {"update_display": {"skipped": f"Tk unavailable: {e}"}}
+
+    class HeadlessGUI(PoultryGeistGUI):
+        def show_intro(self):
+            self.update_display()
+
+    root.withdraw()
+    results = {}
+    try:
+        for size in DISPLAY_FLOCK_SIZES:
+            gui = HeadlessGUI(root)
+            gui.game_state = farm_with_flock(size)
+
+            def redraw():
+                gui.update_display()
+                root.update_idletasks()
+
+            results[f"update_display[{size}]"] = timed(redraw, 200 * scale)
+            for widget in root.winfo_children():
+                widget.destroy()
+
+        # A long session: one turn's worth of messages per flush, far past the line cap
+        gui = HeadlessGUI(root)
+        turn_messages = end_turn(farm_with_flock(15))
+
+        def log_turn():
+            gui.message_log.extend(turn_messages)
+            gui.message_log.flush()
+
+        results["message_log[turn]"] = timed(log_turn, 5000 * scale)
+    finally:
+        root.destroy()
+    return results
+
+def run(scale=1, gui=True):
+    results = {}
+    results.update(bench_turn_pipeline(scale))
+    results.update(bench_games(scale))
+    results.update(bench_flock_ops(scale))
+    results.update(bench_saves(scale))
+    results.update(bench_console(scale))
+    results.update(bench_server(scale))
+    results.update(bench_session_store(scale))
+    results.update(bench_startup(scale))
+    if gui:
+        results.update(bench_gui(scale))
+    return {
+        "meta": {
+            "seed": SEED,
+            "scale": scale,
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Poultry Geist turn pipeline.")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    parser.add_argument("--quick", action="store_true", help="run a tenth of the iterations")
+    parser.add_argument("--no-gui", action="store_true", help="skip the Tk benchmarks")
+    args = parser.parse_args()
+    report = run(scale=0.1 if args.quick else 1, gui=not args.no_gui)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
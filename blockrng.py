@@ -0,0 +1,43 @@
+"""Block-drawn random numbers for headless games.
+
+``BlockRNG`` stands in for ``GameState.rng``. Instead of asking a generator for
+one uniform per roll, it draws a block of uniforms from a NumPy ``Generator``
+in one call and hands them out in order, refilling when the block runs out.
+The refill is amortized over many turns of rolls.
+
+NumPy produces the same doubles whether they are drawn one at a time or in
+blocks of any size, so a game sees the same rolls in the same order whatever
+``block_size`` is. Each seed goes through ``SeedSequence``, so games seeded
+with neighbouring integers still get independent streams.
+"""
+
+from itertools import chain
+
+import numpy as np
+
+BLOCK_SIZE = 256
+# SeedSequence only takes non-negative entropy. Negative seeds, which
+# random.Random accepts, are used as their 128-bit two's complement, so -1 and
+# 1 still give different streams.
+SEED_MASK = (1 << 128) - 1
+
+
+class BlockRNG:
+    # random() is the __next__ of a chained iterator over the blocks, so a
+    # draw is a C-level call and a refill happens only when a block runs out
+    __slots__ = ("generator", "block_size", "refills", "random")
+
+    def __init__(self, seed=None, block_size=BLOCK_SIZE):
+        if isinstance(seed, int) and seed < 0:
+            seed &= SEED_MASK
+        self.generator = np.random.default_rng(np.random.SeedSequence(seed))
+        self.block_size = block_size
+        self.refills = 0
+        self.random = chain.from_iterable(self._blocks()).__next__
+
+    def _blocks(self):
+        while True:
+            self.refills += 1
+            # tolist() hands back Python floats, which are cheaper to compare
+            # than NumPy scalars on the hot path
+            yield self.generator.random(self.block_size).tolist()
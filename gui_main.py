@@ -1,17 +1,230 @@
+import startup  # first, so a startup profile sees every other import
+import importlib
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-import random
-import os
-from collections import Counter
+from itertools import islice
+from tkinter import ttk
 from main import (
-    GameState, Chicken, GhostChicken, CHICKEN_STATS, COOP_UPGRADES, 
-    SEASONS, EVENTS, VICTORY_EGGS, VICTORY_CASH, VICTORY_MEAT,
-    GHOST_EXCHANGE_RATES, HATCHING_COST, HATCHING_SUCCESS_RATE,
-    EVENT_CHANCE, process_turn_start, lose_chicken, check_victory_conditions,
-    check_game_over
+    GameState, RULES, CHICKEN_STATS, COOP_UPGRADES, INITIAL_CASH, INITIAL_FEED,
+    VICTORY_EGGS, VICTORY_CASH, VICTORY_MEAT, GHOST_EXCHANGE_RATES, HATCHING_COST,
+    get_chicken_price, get_feed_price, get_egg_price, get_hatch_rate,
+    get_usable_ghosts, get_bronze_chickens, is_victory, is_bankrupt
 )
 
+class LazyModule:
+    # Imports a module the first time one of its attributes is used, so the
+    # window can come up before dialog, save and policy code is loaded
+    def __init__(self, name):
+        self.name = name
+        self.module = None
+
+    def __getattr__(self, attribute):
+        if self.module is None:
+            self.module = importlib.import_module(self.name)
+        return getattr(self.module, attribute)
+
+messagebox = LazyModule("tkinter.messagebox")
+simpledialog = LazyModule("tkinter.simpledialog")
+savegame = LazyModule("savegame")
+simulate = LazyModule("simulate")
+
+GUI_SAVE = "gui"  # name of the GUI game's save in savegame.SAVE_DIR
+
+class FlockView:
+    # Scrollable list of the chickens in the coop. Only the rows inside the
+    # viewport exist: a small pool of labels is moved and relabelled as the
+    # view scrolls or the flock changes, and a label is only reconfigured when
+    # what it shows actually changed, so a redraw costs the same for 5 birds
+    # as for 5000.
+    # The view draws from its own copy of the rows, taken in show(): scroll
+    # and resize redraws run between auto-play turns, without the state lock,
+    # while the worker thread may be changing the live flock.
+    ROW_HEIGHT = 26
+    
+    def __init__(self, parent, bg='#8FBC8F'):
+        self.bg = bg
+        self.birds = ()  # (tier, breed, current health) per chicken, copied in show()
+        self.rows = []   # pooled (label, canvas item) pairs
+        self.shown = []  # (flock index, text) displayed by each pooled row, or None
+        self.pending = None
+        self.region = None
+        
+        self.frame = tk.Frame(parent, bg=bg)
+        self.canvas = tk.Canvas(self.frame, bg=bg, highlightthickness=0, yscrollincrement=self.ROW_HEIGHT)
+        scrollbar = tk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.canvas.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.canvas.config(yscrollcommand=lambda first, last: (scrollbar.set(first, last), self.schedule_render()))
+        
+        self.empty_label = tk.Label(self.canvas, text="No chickens in coop", bg=bg, font=('Arial', 10), fg='gray')
+        self.empty_item = self.canvas.create_window(0, 20, window=self.empty_label, anchor=tk.N, state=tk.HIDDEN)
+        
+        self.canvas.bind("<Configure>", self.on_resize)
+        self.bind_wheel(self.canvas)
+        
+    def bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self.on_wheel)
+        widget.bind("<Button-4>", self.on_wheel)
+        widget.bind("<Button-5>", self.on_wheel)
+        
+    def on_wheel(self, event):
+        step = -1 if event.num == 4 or event.delta > 0 else 1
+        self.canvas.yview_scroll(3 * step, "units")
+        
+    def on_resize(self, event):
+        self.canvas.coords(self.empty_item, event.width // 2, 20)
+        for _, item in self.rows:
+            self.canvas.itemconfigure(item, width=max(1, event.width - 10))
+        self.schedule_render()
+        
+    def schedule_render(self):
+        # Scrolling can fire many events per frame; render once when idle
+        if self.pending is None:
+            self.pending = self.canvas.after_idle(self.render)
+            
+    def show(self, chickens):
+        # Callers hold the state lock while auto-play is running
+        self.birds = [(c.tier, c.breed, c.current_health) for c in chickens]
+        self.render()
+        
+    @staticmethod
+    def row_text(bird):
+        tier, breed, health = bird
+        emoji = "🐔" if tier == "Bronze" else "🦆" if tier == "Silver" else "🐓"
+        return f"{emoji} {tier} {breed} (Health: {health})"
+        
+    def add_row(self):
+        label = tk.Label(self.canvas, bg=self.bg, font=('Arial', 10), relief=tk.RIDGE, bd=1, anchor=tk.W, padx=5)
+        item = self.canvas.create_window(5, 0, window=label, anchor=tk.NW, state=tk.HIDDEN,
+                                         width=max(1, self.canvas.winfo_width() - 10), height=self.ROW_HEIGHT - 4)
+        self.bind_wheel(label)
+        self.rows.append((label, item))
+        self.shown.append(None)
+        
+    def render(self):
+        if self.pending is not None:
+            self.canvas.after_cancel(self.pending)
+            self.pending = None
+        count = len(self.birds)
+        # Setting the scroll region fires yscrollcommand, so only touch it on change
+        region = (0, 0, self.canvas.winfo_width(), count * self.ROW_HEIGHT)
+        if region != self.region:
+            self.canvas.config(scrollregion=region)
+            self.region = region
+        self.canvas.itemconfigure(self.empty_item, state=tk.HIDDEN if count else tk.NORMAL)
+        
+        first = max(0, int(self.canvas.canvasy(0)) // self.ROW_HEIGHT)
+        visible = self.canvas.winfo_height() // self.ROW_HEIGHT + 2
+        used = 0
+        for index, bird in enumerate(islice(self.birds, first, first + visible), first):
+            if used == len(self.rows):
+                self.add_row()
+            label, item = self.rows[used]
+            text = self.row_text(bird)
+            shown = self.shown[used]
+            if shown is None or shown[0] != index:
+                self.canvas.coords(item, 5, index * self.ROW_HEIGHT + 2)
+            if shown is None or shown[1] != text:
+                label.config(text=text)
+            if shown is None:
+                self.canvas.itemconfigure(item, state=tk.NORMAL)
+            self.shown[used] = (index, text)
+            used += 1
+        for slot in range(used, len(self.rows)):
+            if self.shown[slot] is not None:
+                self.canvas.itemconfigure(self.rows[slot][1], state=tk.HIDDEN)
+                self.shown[slot] = None
+
+
+class MessageLog:
+    # The message area as a bounded log. Messages are queued and written to the
+    # Text widget in one insert and one scroll when Tk is next idle, so a turn's
+    # worth of messages costs a single update. Only the newest max_lines lines
+    # are kept; older ones are trimmed from the top.
+    MAX_LINES = 500
+    
+    def __init__(self, text, max_lines=MAX_LINES):
+        self.text = text
+        self.max_lines = max_lines
+        self.pending = []
+        self.flush_id = None
+        
+    def add(self, message):
+        self.pending.append(message)
+        self.schedule_flush()
+        
+    def extend(self, messages):
+        self.pending.extend(messages)
+        self.schedule_flush()
+        
+    def schedule_flush(self):
+        if self.flush_id is None and self.pending:
+            self.flush_id = self.text.after_idle(self.flush)
+            
+    def flush(self):
+        if self.flush_id is not None:
+            self.text.after_cancel(self.flush_id)
+            self.flush_id = None
+        if not self.pending:
+            return
+        # Lines that would be trimmed straight away are never inserted
+        batch = self.pending[-self.max_lines:]
+        self.pending = []
+        self.text.insert(tk.END, "\n".join(batch) + "\n")
+        # The widget always ends in an empty line after the last newline
+        lines = int(self.text.index("end-1c").split(".")[0]) - 1
+        if lines > self.max_lines:
+            self.text.delete("1.0", f"{lines - self.max_lines + 1}.0")
+        self.text.see(tk.END)
+
+class AutoPlayer(threading.Thread):
+    # Plays turns on a worker thread: with a policy it takes the policy's
+    # actions each turn, otherwise it only ends turns. The GUI reads the same
+    # GameState, so every change is made while holding `lock`; the policy
+    # decides on a copy so a slow policy never blocks a redraw.
+    def __init__(self, session, lock, turns=None, policy=None):
+        super().__init__(daemon=True)
+        self.session = session
+        self.game_state = session.state
+        self.lock = lock
+        self.turns = turns
+        self.policy = policy
+        self.messages = []
+        self.stop_requested = threading.Event()
+        
+    def stop(self):
+        self.stop_requested.set()
+        
+    def take_messages(self):
+        # Call with the lock held
+        messages, self.messages = self.messages, []
+        return messages
+        
+    def decide(self):
+        with self.lock:
+            view = GameState.from_snapshot(self.game_state.snapshot())
+        return self.policy(view)
+        
+    def run(self):
+        played = 0
+        while not self.stop_requested.is_set() and (self.turns is None or played < self.turns):
+            if self.policy is not None:
+                for _ in range(simulate.MAX_ACTIONS_PER_TURN):
+                    action = self.decide()
+                    if action[0] == "end_turn" or self.stop_requested.is_set():
+                        break
+                    with self.lock:
+                        self.messages.extend(self.session.apply(action))
+            with self.lock:
+                self.messages.extend(self.session.apply(("end_turn",)))
+                state = self.game_state
+                if is_victory(state, state.eggs_this_turn) or is_bankrupt(state):
+                    break
+            played += 1
+
 class PoultryGeistGUI:
+    REFRESH_MS = 33  # redraw rate while auto-play runs, about 30 frames a second
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Poultry Geist - Digital Farm Management Simulator")
@@ -19,9 +232,20 @@ class PoultryGeistGUI:
         self.root.configure(bg='#2E5C3E')
         
         self.game_state = GameState()
+        # Journals every action so the farm survives the window closing;
+        # opened once the intro is dismissed
+        self.session = None
         self.turn_messages = []
+        # Snapshots for undo/redo of actions within the current turn
+        self.undo_stack = []
+        self.redo_stack = []
+        # Auto-play: the worker thread and the lock it holds while changing game_state
+        self.autoplayer = None
+        self.state_lock = threading.Lock()
+        self.action_buttons = []
         
         self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.show_intro()
         
     def setup_ui(self):
@@ -65,20 +289,20 @@ class PoultryGeistGUI:
         self.turn_label = tk.Label(info_frame, text="Turn: 1", font=('Arial', 10), bg='#4A7C59', fg='white')
         self.turn_label.pack(anchor=tk.W)
         
-        self.season_label = tk.Label(info_frame, text="Season: Spring", font=('Arial', 10), bg='#4A7C59', fg='white')
+        self.season_label = tk.Label(info_frame, text=f"Season: {RULES.season_names[0]}", font=('Arial', 10), bg='#4A7C59', fg='white')
         self.season_label.pack(anchor=tk.W)
         
         # Resources
         resources_frame = tk.Frame(self.top_frame, bg='#4A7C59')
         resources_frame.pack(side=tk.LEFT, padx=20, pady=5)
         
-        self.cash_label = tk.Label(resources_frame, text="Cash: $15", font=('Arial', 10), bg='#4A7C59', fg='white')
+        self.cash_label = tk.Label(resources_frame, text=f"Cash: ${INITIAL_CASH}", font=('Arial', 10), bg='#4A7C59', fg='white')
         self.cash_label.pack(anchor=tk.W)
         
-        self.banked_label = tk.Label(resources_frame, text="Banked: $0/50", font=('Arial', 10), bg='#4A7C59', fg='white')
+        self.banked_label = tk.Label(resources_frame, text=f"Banked: $0/{VICTORY_CASH}", font=('Arial', 10), bg='#4A7C59', fg='white')
         self.banked_label.pack(anchor=tk.W)
         
-        self.feed_label = tk.Label(resources_frame, text="Feed: 10", font=('Arial', 10), bg='#4A7C59', fg='white')
+        self.feed_label = tk.Label(resources_frame, text=f"Feed: {INITIAL_FEED}", font=('Arial', 10), bg='#4A7C59', fg='white')
         self.feed_label.pack(anchor=tk.W)
         
         # Victory progress
@@ -100,8 +324,8 @@ class PoultryGeistGUI:
         self.coop_label.pack(pady=5)
         
         # Chickens display
-        self.chickens_frame = tk.Frame(self.farm_frame, bg='#8FBC8F')
-        self.chickens_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.flock_view = FlockView(self.farm_frame)
+        self.flock_view.frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Resources display
         resources_display = tk.Frame(self.farm_frame, bg='#8FBC8F')
@@ -120,39 +344,62 @@ class PoultryGeistGUI:
         market_frame = tk.LabelFrame(self.actions_frame, text="Market", bg='#4A7C59', fg='white', font=('Arial', 10, 'bold'))
         market_frame.pack(fill=tk.X, padx=10, pady=5)
         
-        tk.Button(market_frame, text="Buy Chicken", command=self.buy_chicken, width=15).pack(pady=2)
-        tk.Button(market_frame, text="Sell Chicken", command=self.sell_chicken, width=15).pack(pady=2)
-        tk.Button(market_frame, text="Buy Feed", command=self.buy_feed, width=15).pack(pady=2)
-        tk.Button(market_frame, text="Sell Eggs", command=self.sell_eggs, width=15).pack(pady=2)
+        self.action_button(market_frame, "Buy Chicken", self.buy_chicken, width=15).pack(pady=2)
+        self.action_button(market_frame, "Sell Chicken", self.sell_chicken, width=15).pack(pady=2)
+        self.action_button(market_frame, "Buy Feed", self.buy_feed, width=15).pack(pady=2)
+        self.action_button(market_frame, "Sell Eggs", self.sell_eggs, width=15).pack(pady=2)
         
         # Farm actions
         farm_frame = tk.LabelFrame(self.actions_frame, text="Farm", bg='#4A7C59', fg='white', font=('Arial', 10, 'bold'))
         farm_frame.pack(fill=tk.X, padx=10, pady=5)
         
-        tk.Button(farm_frame, text="Harvest for Meat", command=self.harvest_chicken, width=15).pack(pady=2)
-        tk.Button(farm_frame, text="Hatch Eggs", command=self.hatch_eggs, width=15).pack(pady=2)
-        tk.Button(farm_frame, text="Upgrade Coop", command=self.upgrade_coop, width=15).pack(pady=2)
+        self.action_button(farm_frame, "Harvest for Meat", self.harvest_chicken, width=15).pack(pady=2)
+        self.action_button(farm_frame, "Hatch Eggs", self.hatch_eggs, width=15).pack(pady=2)
+        self.action_button(farm_frame, "Upgrade Coop", self.upgrade_coop, width=15).pack(pady=2)
         
         # Financial actions
         financial_frame = tk.LabelFrame(self.actions_frame, text="Banking", bg='#4A7C59', fg='white', font=('Arial', 10, 'bold'))
         financial_frame.pack(fill=tk.X, padx=10, pady=5)
         
-        tk.Button(financial_frame, text="Bank Cash", command=self.bank_cash, width=15).pack(pady=2)
+        self.action_button(financial_frame, "Bank Cash", self.bank_cash, width=15).pack(pady=2)
         
         # Ghost actions
         ghost_frame = tk.LabelFrame(self.actions_frame, text="Supernatural", bg='#4A7C59', fg='white', font=('Arial', 10, 'bold'))
         ghost_frame.pack(fill=tk.X, padx=10, pady=5)
         
-        tk.Button(ghost_frame, text="Manage Ghosts", command=self.manage_ghosts, width=15).pack(pady=2)
-        tk.Button(ghost_frame, text="Use Ghost Ability", command=self.use_ghost_ability, width=15).pack(pady=2)
+        self.action_button(ghost_frame, "Manage Ghosts", self.manage_ghosts, width=15).pack(pady=2)
+        self.action_button(ghost_frame, "Use Ghost Ability", self.use_ghost_ability, width=15).pack(pady=2)
         
         # Turn control
         turn_frame = tk.Frame(self.actions_frame, bg='#4A7C59')
-        turn_frame.pack(fill=tk.X, padx=10, pady=20)
+        turn_frame.pack(fill=tk.X, padx=10, pady=10)
         
-        tk.Button(turn_frame, text="NEXT TURN", command=self.next_turn, 
+        self.action_button(turn_frame, "NEXT TURN", self.next_turn, 
                  bg='#228B22', fg='white', font=('Arial', 12, 'bold'), width=15).pack(pady=5)
         
+        undo_frame = tk.Frame(turn_frame, bg='#4A7C59')
+        undo_frame.pack()
+        self.action_button(undo_frame, "Undo", self.undo, width=7).pack(side=tk.LEFT, padx=2)
+        self.action_button(undo_frame, "Redo", self.redo, width=7).pack(side=tk.LEFT, padx=2)
+        
+        # Fast-forward: turns run on a worker thread while the window stays live
+        auto_frame = tk.LabelFrame(self.actions_frame, text="Auto-Play", bg='#4A7C59', fg='white', font=('Arial', 10, 'bold'))
+        auto_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        self.action_button(auto_frame, "Advance N Turns", self.advance_turns, width=15).pack(pady=2)
+        self.policy_choice = ttk.Combobox(auto_frame, values=[name.title() for name in simulate.POLICIES], state="readonly", width=13)
+        self.policy_choice.current(0)
+        self.policy_choice.pack(pady=2)
+        self.action_button(auto_frame, "Auto-Play", self.start_autoplay, width=15).pack(pady=2)
+        self.stop_button = tk.Button(auto_frame, text="Stop", command=self.stop_autoplay, width=15, state=tk.DISABLED)
+        self.stop_button.pack(pady=2)
+        
+    def action_button(self, parent, text, command, **options):
+        # Buttons that touch the game state; disabled while auto-play runs
+        button = tk.Button(parent, text=text, command=command, **options)
+        self.action_buttons.append(button)
+        return button
+        
     def create_message_area(self):
         # Messages
         messages_frame = tk.Frame(self.bottom_frame, bg='#4A7C59')
@@ -166,6 +413,7 @@ class PoultryGeistGUI:
         scrollbar = tk.Scrollbar(messages_frame, orient=tk.VERTICAL, command=self.message_text.yview)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.message_text.config(yscrollcommand=scrollbar.set)
+        self.message_log = MessageLog(self.message_text)
         
         # Graveyard and ghosts
         spirit_frame = tk.Frame(self.bottom_frame, bg='#4A7C59')
@@ -180,14 +428,14 @@ class PoultryGeistGUI:
         self.ghosts_label.pack(pady=5)
         
     def show_intro(self):
-        intro_text = """Welcome to Poultry Geist!
+        intro_text = f"""Welcome to Poultry Geist!
 
 Build a thriving poultry farm by managing your flock and resources.
 
 Your goal is to achieve the following in a single year:
-• Produce 20 eggs in a single turn
-• Bank $50 cash
-• Harvest 30 meat
+• Produce {VICTORY_EGGS} eggs in a single turn
+• Bank ${VICTORY_CASH} cash
+• Harvest {VICTORY_MEAT} meat
 
 When your chickens die, their spirits linger. Collect enough spirits
 to summon powerful Ghost Chickens with unique abilities.
@@ -195,8 +443,28 @@ to summon powerful Ghost Chickens with unique abilities.
 Good luck, farmer!"""
         
         messagebox.showinfo("Poultry Geist", intro_text)
+        self.start_session()
         self.update_display()
         
+    def start_session(self):
+        if savegame.has_save(GUI_SAVE) and messagebox.askyesno("Poultry Geist", "Resume your saved farm?"):
+            try:
+                self.session, messages = savegame.Session.resume(GUI_SAVE)
+                self.game_state = self.session.state
+                self.message_log.extend(messages)
+                return
+            except (OSError, savegame.SaveError) as e:
+                messagebox.showwarning("Poultry Geist", f"Your saved farm could not be loaded ({e}).\nStarting a new one.")
+        self.session = savegame.Session(GUI_SAVE, self.game_state)
+        
+    def on_close(self):
+        if self.autoplayer is not None:
+            self.autoplayer.stop()
+            self.autoplayer.join()
+        if self.session is not None:
+            self.session.close()
+        self.root.destroy()
+        
     def update_display(self):
         # Update game state labels
         self.year_label.config(text=f"Year: {self.game_state.year}")
@@ -218,22 +486,10 @@ Good luck, farmer!"""
         self.coop_label.config(text=f"{coop_name}: {len(self.game_state.chickens)}/{self.game_state.get_coop_capacity()}")
         
         # Update chickens display
-        for widget in self.chickens_frame.winfo_children():
-            widget.destroy()
-            
-        if self.game_state.chickens:
-            for i, chicken in enumerate(self.game_state.chickens):
-                chicken_frame = tk.Frame(self.chickens_frame, bg='#8FBC8F', relief=tk.RIDGE, bd=1)
-                chicken_frame.pack(fill=tk.X, pady=2, padx=5)
-                
-                emoji = "🐔" if chicken.tier == "Bronze" else "🦆" if chicken.tier == "Silver" else "🐓"
-                text = f"{emoji} {chicken.tier} {chicken.breed} (Health: {chicken.current_health})"
-                tk.Label(chicken_frame, text=text, bg='#8FBC8F', font=('Arial', 10)).pack(anchor=tk.W, padx=5)
-        else:
-            tk.Label(self.chickens_frame, text="No chickens in coop", bg='#8FBC8F', font=('Arial', 10), fg='gray').pack(pady=20)
+        self.flock_view.show(self.game_state.chickens)
             
         # Update graveyard and ghosts
-        graveyard_counts = Counter(c.tier for c in self.game_state.graveyard)
+        graveyard_counts = self.game_state.graveyard_counts
         graveyard_text = f"Graveyard:\nBronze: {graveyard_counts['Bronze']}\nSilver: {graveyard_counts['Silver']}\nGold: {graveyard_counts['Gold']}"
         self.graveyard_label.config(text=graveyard_text)
         
@@ -244,22 +500,41 @@ Good luck, farmer!"""
         self.ghosts_label.config(text=ghost_text)
         
     def add_message(self, message):
-        self.message_text.insert(tk.END, message + "\n")
-        self.message_text.see(tk.END)
+        self.message_log.add(message)
+        
+    def perform(self, action):
+        snapshot = self.game_state.snapshot()
+        messages = self.session.apply(action)
+        self.undo_stack.append(snapshot)
+        self.redo_stack.clear()
+        self.message_log.extend(messages)
+        self.update_display()
+        
+    def undo(self):
+        if not self.undo_stack:
+            self.add_message("Nothing to undo this turn.")
+            return
+        self.redo_stack.append(self.game_state.snapshot())
+        self.game_state.restore(self.undo_stack.pop())
+        self.session.checkpoint()  # the journal can't replay an undo
+        self.add_message("Undid the last action.")
+        self.update_display()
+        
+    def redo(self):
+        if not self.redo_stack:
+            self.add_message("Nothing to redo.")
+            return
+        self.undo_stack.append(self.game_state.snapshot())
+        self.game_state.restore(self.redo_stack.pop())
+        self.session.checkpoint()
+        self.add_message("Redid the last action.")
+        self.update_display()
         
     def buy_chicken(self):
         dialog = ChickenBuyDialog(self.root, self.game_state)
         if dialog.result:
             breed, cost = dialog.result
-            if self.game_state.cash >= cost:
-                if self.game_state.add_chicken(breed, CHICKEN_STATS[breed]["tier"], cost):
-                    self.game_state.cash -= cost
-                    self.add_message(f"You bought a {breed} for ${cost}.")
-                else:
-                    self.add_message("Your coop is full!")
-            else:
-                self.add_message("Not enough cash.")
-            self.update_display()
+            self.perform(("buy_chicken", breed))
             
     def sell_chicken(self):
         if not self.game_state.chickens:
@@ -268,45 +543,24 @@ Good luck, farmer!"""
             
         dialog = ChickenSellDialog(self.root, self.game_state)
         if dialog.result is not None:
-            chicken_index = dialog.result
-            sold_chicken = self.game_state.chickens.pop(chicken_index)
-            sale_price = sold_chicken.get_sale_price(self.game_state.season)
-            self.game_state.cash += sale_price
-            self.add_message(f"You sold a {sold_chicken} for ${sale_price}.")
-            self.update_display()
+            self.perform(("sell_chicken", dialog.result))
             
     def buy_feed(self):
-        feed_price = 1.0
-        if self.game_state.season == "Winter":
-            feed_price += SEASONS["Winter"]["feed_cost_increase"]
-            
+        feed_price = get_feed_price(self.game_state)
         amount = simpledialog.askinteger("Buy Feed", f"How much feed to buy? (${feed_price:.2f} per unit)")
         if amount and amount > 0:
-            cost = amount * feed_price
-            if self.game_state.cash >= cost:
-                self.game_state.feed += amount
-                self.game_state.cash -= cost
-                self.add_message(f"You bought {amount} units of feed.")
-            else:
-                self.add_message("Not enough cash.")
-            self.update_display()
+            self.perform(("buy_feed", amount))
             
     def sell_eggs(self):
         if self.game_state.eggs <= 0:
             self.add_message("You have no eggs to sell.")
             return
             
-        egg_price = int(1 * self.game_state.egg_price_multiplier)
+        egg_price = get_egg_price(self.game_state)
         amount = simpledialog.askinteger("Sell Eggs", 
                                        f"You have {self.game_state.eggs} eggs. Current price: ${egg_price} per egg.\nHow many to sell?")
-        if amount and 0 < amount <= self.game_state.eggs:
-            earnings = amount * egg_price
-            self.game_state.eggs -= amount
-            self.game_state.cash += earnings
-            self.add_message(f"You sold {amount} eggs for ${earnings}.")
-            self.update_display()
-        elif amount and amount > self.game_state.eggs:
-            self.add_message("You don't have that many eggs.")
+        if amount:
+            self.perform(("sell_eggs", amount))
             
     def harvest_chicken(self):
         if not self.game_state.chickens:
@@ -315,22 +569,10 @@ Good luck, farmer!"""
             
         dialog = ChickenHarvestDialog(self.root, self.game_state)
         if dialog.result is not None:
-            chicken_index = dialog.result
-            harvested_chicken = self.game_state.chickens.pop(chicken_index)
-            self.game_state.graveyard.append(harvested_chicken)
-            meat_yield = harvested_chicken.meat_value
-            if self.game_state.season == "Fall":
-                meat_yield = int(meat_yield * (1 + SEASONS["Fall"]["meat_bonus"]))
-            self.game_state.meat += meat_yield
-            self.game_state.meat_harvested_this_year += meat_yield
-            self.add_message(f"You harvested a {harvested_chicken} for {meat_yield} meat.")
-            self.update_display()
+            self.perform(("harvest_chicken", dialog.result))
             
     def hatch_eggs(self):
-        hatch_rate = HATCHING_SUCCESS_RATE
-        if self.game_state.season == "Spring":
-            hatch_rate += SEASONS["Spring"]["hatching_bonus"]
-            
+        hatch_rate = get_hatch_rate(self.game_state)
         if self.game_state.eggs < HATCHING_COST:
             self.add_message("You don't have enough eggs to attempt hatching.")
             return
@@ -338,25 +580,12 @@ Good luck, farmer!"""
         result = messagebox.askyesno("Hatch Eggs", 
                                    f"It costs {HATCHING_COST} eggs to attempt to hatch a new chick.\nCurrent success rate: {hatch_rate:.0%}\nAttempt to hatch?")
         if result:
-            self.game_state.eggs -= HATCHING_COST
-            if random.random() < hatch_rate:
-                if self.game_state.add_chicken("Pearl Leghorn", "Bronze", CHICKEN_STATS["Pearl Leghorn"]["cash"]):
-                    self.add_message("Success! A new Pearl Leghorn chick has hatched!")
-                else:
-                    self.add_message("The egg hatched, but your coop is full! The chick ran away.")
-            else:
-                self.add_message("The egg didn't hatch.")
-            self.update_display()
+            self.perform(("hatch_eggs",))
             
     def bank_cash(self):
         amount = simpledialog.askinteger("Bank Cash", f"You have ${self.game_state.cash} to bank.\nHow much to bank?")
-        if amount and 0 < amount <= self.game_state.cash:
-            self.game_state.cash -= amount
-            self.game_state.banked_cash += amount
-            self.add_message(f"You banked ${amount}.")
-            self.update_display()
-        elif amount and amount > self.game_state.cash:
-            self.add_message("You don't have that much cash.")
+        if amount:
+            self.perform(("bank_cash", amount))
             
     def upgrade_coop(self):
         next_level = self.game_state.coop_level + 1
@@ -373,107 +602,98 @@ Good luck, farmer!"""
             
         result = messagebox.askyesno("Upgrade Coop", f"Upgrade to {upgrade_name} for ${upgrade_cost}?")
         if result:
-            self.game_state.cash -= upgrade_cost
-            self.game_state.coop_level = next_level
-            self.add_message(f"Congratulations! You've upgraded to the {upgrade_name}.")
-            self.update_display()
+            self.perform(("upgrade_coop",))
             
     def manage_ghosts(self):
         dialog = GhostManagementDialog(self.root, self.game_state)
-        if dialog.result:
-            ghost_type = dialog.result
-            graveyard_counts = Counter(c.tier for c in self.game_state.graveyard)
-            
-            if graveyard_counts[ghost_type] >= GHOST_EXCHANGE_RATES[ghost_type]:
-                # Remove spirits from graveyard
-                removed_count = 0
-                new_graveyard = []
-                for chicken in self.game_state.graveyard:
-                    if chicken.tier == ghost_type and removed_count < GHOST_EXCHANGE_RATES[ghost_type]:
-                        removed_count += 1
-                    else:
-                        new_graveyard.append(chicken)
-                self.game_state.graveyard = new_graveyard
-                self.game_state.ghost_chickens.append(GhostChicken(ghost_type))
-                self.add_message(f"You have created a {ghost_type} Ghost!")
-                self.update_display()
-            else:
-                self.add_message(f"Not enough {ghost_type} spirits.")
+        if dialog.result == "all":
+            self.perform(("exchange_all_ghosts",))
+        elif dialog.result:
+            self.perform(("exchange_ghost", dialog.result))
                 
     def use_ghost_ability(self):
-        usable_ghosts = [g for g in self.game_state.ghost_chickens if g.original_tier != "Bronze"]
+        usable_ghosts = get_usable_ghosts(self.game_state)
         if not usable_ghosts:
             self.add_message("No active ghost abilities available.")
             return
             
         dialog = GhostAbilityDialog(self.root, self.game_state, usable_ghosts)
         if dialog.result:
-            ghost, action = dialog.result
-            
-            if ghost.original_tier == "Silver":
-                self.game_state.double_eggs_active = True
-                self.game_state.ghost_chickens.remove(ghost)
-                self.add_message("The Silver Ghost is consumed to double your egg production next turn.")
-                
-            elif ghost.original_tier == "Gold" and action:
-                chicken_to_convert = action
-                self.game_state.chickens.remove(chicken_to_convert)
-                self.game_state.add_chicken("Duck", "Silver", CHICKEN_STATS["Duck"]["cash"])
-                self.game_state.ghost_chickens.remove(ghost)
-                self.add_message(f"The Gold Ghost is consumed to transform your {chicken_to_convert.breed} into a Silver Duck!")
-                
-            self.update_display()
+            self.perform(("use_ghost_ability", *dialog.result))
             
     def next_turn(self):
-        # Calculate feed consumption
-        feed_consumption_multiplier = 1.0
-        if self.game_state.season == "Summer":
-            feed_consumption_multiplier += SEASONS["Summer"]["feed_increase"]
-            
-        silver_ghost_count = sum(1 for g in self.game_state.ghost_chickens if g.original_tier == "Silver")
-        feed_needed = 0
-        for chicken in self.game_state.chickens:
-            reduction = 0
-            if chicken.tier == "Silver" and silver_ghost_count > 0:
-                reduction = silver_ghost_count
-            consumption = max(0, chicken.feed_consumption - reduction)
-            feed_needed += int(consumption * feed_consumption_multiplier)
-            
-        if self.game_state.feed >= feed_needed:
-            self.game_state.feed -= feed_needed
-            self.add_message(f"Your chickens consumed {feed_needed} feed.")
-        else:
-            self.add_message("Not enough feed! Your chickens are starving.")
-            lose_chicken(self.game_state, self.turn_messages)
-            
-        if self.game_state.season == "Winter" and random.random() < SEASONS["Winter"]["illness_chance"]:
-            self.add_message("A winter illness is spreading...")
-            lose_chicken(self.game_state, self.turn_messages)
-            
-        self.game_state.next_turn()
+        # Turns are final: undo only reaches back to the start of the current turn
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.message_log.extend(self.session.apply(("end_turn",)))
+        self.after_turn()
         
-        # Process turn start for next turn
-        turn_messages, eggs_this_turn = process_turn_start(self.game_state)
-        for msg in turn_messages:
-            self.add_message(msg)
-            
+    def after_turn(self):
         # Update eggs progress with current turn's production
+        eggs_this_turn = self.game_state.eggs_this_turn
         self.eggs_progress.config(text=f"Eggs: {eggs_this_turn}/{VICTORY_EGGS}")
         
         # Check victory
-        if check_victory_conditions(self.game_state, eggs_this_turn):
+        if is_victory(self.game_state, eggs_this_turn):
+            self.message_log.flush()
+            self.session.discard()
             messagebox.showinfo("Victory!", "Congratulations! You have built a thriving poultry farm and won the game!")
             self.root.quit()
             return
             
         # Check game over
-        if check_game_over(self.game_state):
+        if is_bankrupt(self.game_state):
+            self.message_log.flush()
+            self.session.discard()
             messagebox.showinfo("Game Over", "You have no chickens and not enough cash to buy a new one.\nYour farm has gone bankrupt.")
             self.root.quit()
             return
             
         self.update_display()
-
+        
+    def advance_turns(self):
+        turns = simpledialog.askinteger("Advance Turns", "End how many turns without taking actions?", minvalue=1)
+        if turns:
+            self.start_worker(AutoPlayer(self.session, self.state_lock, turns=turns))
+            
+    def start_autoplay(self):
+        policy = simulate.load_policy(self.policy_choice.get().lower())
+        self.start_worker(AutoPlayer(self.session, self.state_lock, policy=policy))
+        
+    def stop_autoplay(self):
+        if self.autoplayer is not None:
+            self.autoplayer.stop()
+            
+    def start_worker(self, player):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.set_autoplay_controls(True)
+        self.autoplayer = player
+        player.start()
+        self.root.after(self.REFRESH_MS, self.poll_autoplay)
+        
+    def set_autoplay_controls(self, running):
+        state = tk.DISABLED if running else tk.NORMAL
+        for button in self.action_buttons:
+            button.config(state=state)
+        self.policy_choice.config(state=tk.DISABLED if running else "readonly")
+        self.stop_button.config(state=tk.NORMAL if running else tk.DISABLED)
+        
+    def poll_autoplay(self):
+        # Runs on the Tk thread at a fixed rate however fast the worker plays,
+        # so one redraw covers every turn played since the last one
+        player = self.autoplayer
+        with self.state_lock:
+            self.message_log.extend(player.take_messages())
+            self.eggs_progress.config(text=f"Eggs: {self.game_state.eggs_this_turn}/{VICTORY_EGGS}")
+            self.update_display()
+        if player.is_alive():
+            self.root.after(self.REFRESH_MS, self.poll_autoplay)
+            return
+        self.autoplayer = None
+        self.set_autoplay_controls(False)
+        self.after_turn()
+        
 class ChickenBuyDialog:
     def __init__(self, parent, game_state):
         self.result = None
@@ -489,10 +709,7 @@ class ChickenBuyDialog:
                 bg='#4A7C59', fg='white').pack(pady=10)
         
         for breed, stats in CHICKEN_STATS.items():
-            price = stats['cash']
-            if game_state.season == "Spring":
-                price = int(price * (1 - SEASONS["Spring"]["new_chicken_discount"]))
-            price = max(1, price)
+            price = get_chicken_price(game_state, breed)
             
             frame = tk.Frame(dialog, bg='#4A7C59')
             frame.pack(fill=tk.X, padx=20, pady=5)
@@ -587,7 +804,7 @@ class GhostManagementDialog:
         tk.Label(dialog, text="Exchange spirits of fallen chickens for Ghost Chickens:", 
                 font=('Arial', 12, 'bold'), bg='#4A7C59', fg='white').pack(pady=10)
         
-        graveyard_counts = Counter(c.tier for c in game_state.graveyard)
+        graveyard_counts = game_state.graveyard_counts
         
         for tier in ["Bronze", "Silver", "Gold"]:
             frame = tk.Frame(dialog, bg='#4A7C59')
@@ -602,6 +819,10 @@ class GhostManagementDialog:
                            state=tk.NORMAL if available >= required else tk.DISABLED)
             btn.pack(fill=tk.X)
             
+        any_affordable = any(graveyard_counts[t] >= r for t, r in GHOST_EXCHANGE_RATES.items())
+        tk.Button(dialog, text="Exchange All Affordable Spirits", command=lambda: self.select(dialog, "all"),
+                  state=tk.NORMAL if any_affordable else tk.DISABLED).pack(fill=tk.X, padx=20, pady=5)
+            
         tk.Button(dialog, text="Cancel", command=dialog.destroy).pack(pady=10)
         
         # Wait for dialog to be closed
@@ -625,17 +846,17 @@ class GhostAbilityDialog:
         tk.Label(dialog, text="Choose a ghost ability to use:", font=('Arial', 12, 'bold'), 
                 bg='#4A7C59', fg='white').pack(pady=10)
         
-        for ghost in usable_ghosts:
+        for i, ghost in enumerate(usable_ghosts):
             frame = tk.Frame(dialog, bg='#4A7C59')
             frame.pack(fill=tk.X, padx=20, pady=5)
             
             if ghost.original_tier == "Silver":
                 text = f"{ghost.original_tier} Ghost - Sacrifice to double egg production next turn"
-                btn = tk.Button(frame, text=text, command=lambda g=ghost: self.select_silver(dialog, g))
+                btn = tk.Button(frame, text=text, command=lambda idx=i: self.select_silver(dialog, idx))
                 btn.pack(fill=tk.X)
             elif ghost.original_tier == "Gold":
                 text = f"{ghost.original_tier} Ghost - Sacrifice to convert a Bronze chicken to Silver"
-                btn = tk.Button(frame, text=text, command=lambda g=ghost: self.select_gold(dialog, g, game_state))
+                btn = tk.Button(frame, text=text, command=lambda idx=i: self.select_gold(dialog, idx, game_state))
                 btn.pack(fill=tk.X)
                 
         tk.Button(dialog, text="Cancel", command=dialog.destroy).pack(pady=10)
@@ -643,12 +864,14 @@ class GhostAbilityDialog:
         # Wait for dialog to be closed
         dialog.wait_window()
         
-    def select_silver(self, dialog, ghost):
-        self.result = (ghost, None)
+    def select_silver(self, dialog, ghost_index):
+        # A Silver ghost takes no chicken; the action is sent as the console
+        # sends it, with the ghost index alone
+        self.result = (ghost_index,)
         dialog.destroy()
         
-    def select_gold(self, dialog, ghost, game_state):
-        bronze_chickens = [c for c in game_state.chickens if c.tier == "Bronze"]
+    def select_gold(self, dialog, ghost_index, game_state):
+        bronze_chickens = get_bronze_chickens(game_state)
         if not bronze_chickens:
             messagebox.showwarning("No Bronze Chickens", "You have no Bronze chickens to convert.")
             return
@@ -664,9 +887,9 @@ class GhostAbilityDialog:
         tk.Label(subdialog, text="Choose a Bronze chicken to convert:", 
                 font=('Arial', 12, 'bold'), bg='#4A7C59', fg='white').pack(pady=10)
         
-        for chicken in bronze_chickens:
+        for i, chicken in enumerate(bronze_chickens):
             btn = tk.Button(subdialog, text=str(chicken), 
-                           command=lambda c=chicken: self.select_conversion(dialog, subdialog, ghost, c))
+                           command=lambda idx=i: self.select_conversion(dialog, subdialog, ghost_index, idx))
             btn.pack(fill=tk.X, padx=20, pady=5)
             
         tk.Button(subdialog, text="Cancel", command=subdialog.destroy).pack(pady=10)
@@ -674,13 +897,14 @@ class GhostAbilityDialog:
         # Wait for subdialog to be closed
         subdialog.wait_window()
         
-    def select_conversion(self, dialog, subdialog, ghost, chicken):
-        self.result = (ghost, chicken)
+    def select_conversion(self, dialog, subdialog, ghost_index, chicken_index):
+        self.result = (ghost_index, chicken_index)
         subdialog.destroy()
         dialog.destroy()
 
 def main():
     root = tk.Tk()
+    root.after_idle(startup.first_screen, "gui window")
     app = PoultryGeistGUI(root)
     root.mainloop()
 
@@ -1,117 +1,253 @@
+import startup  # first, so a startup profile sees every other import
+import heapq
 import random
-import os
-from collections import Counter
-
-# --- Game Configuration ---
-INITIAL_CASH = 15
-INITIAL_FEED = 10
-INITIAL_CHICKENS = [
-    {"breed": "Pearl Leghorn", "tier": "Bronze"},
-    {"breed": "Pearl Leghorn", "tier": "Bronze"},
-]
-TURNS_PER_SEASON = 5
-EVENT_CHANCE = 0.4 # 40% chance of an event each turn
-HATCHING_COST = 5 # eggs
-HATCHING_SUCCESS_RATE = 0.5
-
-# --- Coop Upgrade Definitions ---
-COOP_UPGRADES = {
-    1: {"name": "Basic Coop", "capacity": 5, "cost": 0},
-    2: {"name": "Expanded Coop", "capacity": 8, "cost": 50},
-    3: {"name": "Deluxe Coop", "capacity": 12, "cost": 150},
-    4: {"name": "Automated Coop", "capacity": 15, "cost": 300},
-}
+import sys
+from collections import deque
+from itertools import islice
 
-# --- Victory Conditions ---
-VICTORY_EGGS = 20
-VICTORY_CASH = 50
-VICTORY_MEAT = 30
+from rules import load_ruleset
+from screen import Screen
 
-# --- Ghost Exchange Rates ---
-GHOST_EXCHANGE_RATES = {
-    "Bronze": 5,
-    "Silver": 3,
-    "Gold": 1,
-}
+# --- Game Rules ---
+# Balance values live in rules.json and are compiled once by rules.py. RULES
+# holds the compiled tables the turn pipeline reads; the names below are the
+# same values in their familiar shapes. Call use_ruleset to swap in another
+# config for the whole engine.
+def use_ruleset(ruleset):
+    global RULES, INITIAL_CASH, INITIAL_FEED, INITIAL_CHICKENS, TURNS_PER_SEASON
+    global EVENT_CHANCE, HATCHING_COST, HATCHING_SUCCESS_RATE, COOP_UPGRADES
+    global VICTORY_EGGS, VICTORY_CASH, VICTORY_MEAT, GHOST_EXCHANGE_RATES
+    global CHICKEN_STATS, SEASONS, EVENTS
+    RULES = ruleset
+    INITIAL_CASH = ruleset.initial_cash
+    INITIAL_FEED = ruleset.initial_feed
+    INITIAL_CHICKENS = ruleset.initial_chickens
+    TURNS_PER_SEASON = ruleset.turns_per_season
+    EVENT_CHANCE = ruleset.event_chance
+    HATCHING_COST = ruleset.hatching_cost
+    HATCHING_SUCCESS_RATE = ruleset.hatching_success_rate
+    COOP_UPGRADES = ruleset.coop_upgrades
+    VICTORY_EGGS = ruleset.victory_eggs
+    VICTORY_CASH = ruleset.victory_cash
+    VICTORY_MEAT = ruleset.victory_meat
+    GHOST_EXCHANGE_RATES = ruleset.ghost_exchange_rates
+    CHICKEN_STATS = ruleset.chicken_stats
+    SEASONS = ruleset.seasons
+    EVENTS = ruleset.events
 
-# --- Chicken Definitions ---
-CHICKEN_STATS = {
-    "Pearl Leghorn": {"eggs": 2, "meat": 1, "feed": 1, "health": 1, "cash": 2, "tier": "Bronze"},
-    "Duck": {"eggs": 4, "meat": 4, "feed": 3, "health": 2, "cash": 10, "tier": "Silver"},
-    "Buff Orpington": {"eggs": 8, "meat": 3, "feed": 3, "health": 2, "cash": 25, "tier": "Gold"},
-}
-
-# --- Season Definitions ---
-SEASONS = {
-    "Spring": {"hatching_bonus": 0.25, "new_chicken_discount": 0.25, "message": "Spring is here! It's a great time to hatch new chicks."},
-    "Summer": {"egg_increase": 0.25, "feed_increase": 0.20, "message": "The summer sun is boosting egg production, but the chickens are eating more."},
-    "Fall": {"meat_bonus": 0.25, "market_increase": 0.10, "message": "It's harvest season! Meat yields are up and market prices are high."},
-    "Winter": {"feed_cost_increase": 0.30, "egg_reduction": 0.15, "illness_chance": 0.10, "message": "Winter has arrived. Feed is more expensive and egg production is down."}
-}
-
-# --- Event Definitions ---
-EVENTS = {
-    "Coldsnap": {"effect": "lose_chicken", "message": "A sudden coldsnap has hit! One of your chickens with the lowest health has died."},
-    "Predation": {"effect": "lose_chicken", "message": "A predator got into the coop! One of your chickens with the lowest health was taken."},
-    "Fertile Hatch": {"effect": "gain_chicken", "message": "One of your chickens laid a fertile egg! You have a new Bronze chicken."},
-    "Market Boom": {"effect": "cash_bonus", "message": "The market is booming! You receive a bonus of 10 cash."},
-    "Good Feed": {"effect": "feed_bonus", "message": "You found a great deal on feed! You receive 10 extra feed."},
-    "Egg Shortage": {"effect": "double_egg_value", "message": "A local egg shortage has doubled the value of your eggs for this turn!"},
-}
+use_ruleset(load_ruleset())
 
 
 class Chicken:
+    __slots__ = ("breed", "tier", "eggs_per_turn", "meat_value", "feed_consumption",
+                 "base_health", "current_health", "cash_value", "purchase_price")
+
     def __init__(self, breed, tier, purchase_price=None):
-        stats = CHICKEN_STATS[breed]
         self.breed = breed
         self.tier = tier
-        self.eggs_per_turn = stats["eggs"]
-        self.meat_value = stats["meat"]
-        self.feed_consumption = stats["feed"]
-        self.base_health = stats["health"]
+        (self.eggs_per_turn, self.meat_value, self.feed_consumption,
+         self.base_health, self.cash_value) = RULES.breed_stats[breed]
         self.current_health = self.base_health
-        self.cash_value = stats["cash"]
         # Track what was actually paid for this chicken
-        self.purchase_price = purchase_price if purchase_price is not None else stats["cash"]
+        self.purchase_price = purchase_price if purchase_price is not None else self.cash_value
 
     def get_sale_price(self, season):
         # Sell for 80% of purchase price, with potential seasonal bonus
         base_sale_price = int(self.purchase_price * 0.8)
-        if season == "Fall":
-            base_sale_price = int(base_sale_price * (1 + SEASONS["Fall"]["market_increase"]))
+        market_bonus = RULES.season_market_bonus[RULES.season_index[season]]
+        if market_bonus:
+            base_sale_price = int(base_sale_price * (1 + market_bonus))
         return max(1, base_sale_price)  # Minimum 1 cash
 
     def __str__(self):
         return f'{self.tier} {self.breed} (Health: {self.current_health})'
 
 class GhostChicken:
+    __slots__ = ("original_tier",)
+
     def __init__(self, original_tier):
         self.original_tier = original_tier
 
     def __str__(self):
         return f"{self.original_tier} Ghost"
 
+class Flock:
+    # List-like container for the chickens in a coop. Iterates in the order birds
+    # were added, like the plain list it replaces, but also keeps a health-ordered
+    # heap and per-tier indexes so lose_chicken and tier filters never scan the
+    # whole coop. Every bird gets a stable integer handle when it is added.
+    __slots__ = ("_birds", "_handles", "_tiers", "_buffed", "_fresh", "_bonus", "_next_handle")
+
+    def __init__(self, chickens=()):
+        self._birds = {}     # handle -> chicken, in insertion order
+        self._handles = {}   # chicken -> handle
+        self._tiers = {}     # tier -> {handle: chicken}
+        # process_turn_start gives every bird the same health bonus, so birds
+        # that were present at the last reset are ordered by base health. Birds
+        # added since then still have their base health and live in _fresh.
+        self._buffed = []    # heap of (base_health, handle)
+        self._fresh = []     # heap of (base_health, handle)
+        self._bonus = 0
+        self._next_handle = 0
+        for chicken in chickens:
+            self.append(chicken)
+
+    def __len__(self):
+        return len(self._birds)
+
+    def __iter__(self):
+        return iter(self._birds.values())
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self._birds)
+        if not 0 <= index < len(self._birds):
+            raise IndexError("flock index out of range")
+        return next(islice(self._birds.values(), index, None))
+
+    def __contains__(self, chicken):
+        return chicken in self._handles
+
+    def _register(self, chicken):
+        handle = self._next_handle
+        self._next_handle += 1
+        self._birds[handle] = chicken
+        self._handles[chicken] = handle
+        self._tiers.setdefault(chicken.tier, {})[handle] = chicken
+        return handle
+
+    def append(self, chicken):
+        handle = self._register(chicken)
+        heapq.heappush(self._fresh, (chicken.base_health, handle))
+        return handle
+
+    def handle(self, chicken):
+        return self._handles[chicken]
+
+    def get(self, handle):
+        return self._birds[handle]
+
+    def remove_handle(self, handle):
+        chicken = self._birds.pop(handle)
+        del self._handles[chicken]
+        del self._tiers[chicken.tier][handle]
+        # Heap entries are dropped lazily; compact once they are mostly stale
+        if len(self._buffed) + len(self._fresh) > 2 * len(self._birds) + 16:
+            self._buffed = [e for e in self._buffed if e[1] in self._birds]
+            self._fresh = [e for e in self._fresh if e[1] in self._birds]
+            heapq.heapify(self._buffed)
+            heapq.heapify(self._fresh)
+        return chicken
+
+    def remove(self, chicken):
+        if chicken not in self._handles:
+            raise ValueError("chicken is not in the flock")
+        self.remove_handle(self._handles[chicken])
+
+    def pop(self, index=-1):
+        chicken = self[index]
+        self.remove(chicken)
+        return chicken
+
+    def tier(self, tier):
+        return list(self._tiers.get(tier, {}).values())
+
+    def tier_count(self, tier):
+        return len(self._tiers.get(tier, ()))
+
+    def reset_health(self, bonus):
+        for chicken in self._birds.values():
+            chicken.current_health = chicken.base_health + bonus
+        for entry in self._fresh:
+            if entry[1] in self._birds:
+                heapq.heappush(self._buffed, entry)
+        self._fresh = []
+        self._bonus = bonus
+
+    @property
+    def health_bonus(self):
+        return self._bonus
+
+    @classmethod
+    def restored(cls, chickens, bonus):
+        # Rebuild a flock whose birds already carry their current_health: those
+        # at base + bonus were present at the last reset, the rest are fresh
+        flock = cls()
+        flock._bonus = bonus
+        for chicken in chickens:
+            handle = flock._register(chicken)
+            if chicken.current_health == chicken.base_health + bonus:
+                flock._buffed.append((chicken.base_health, handle))
+            else:
+                flock._fresh.append((chicken.base_health, handle))
+        heapq.heapify(flock._buffed)
+        heapq.heapify(flock._fresh)
+        return flock
+
+    def _top(self, heap):
+        while heap and heap[0][1] not in self._birds:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def weakest(self):
+        # Same bird as min(chickens, key=current_health): lowest health, and the
+        # earliest added on ties
+        buffed = self._top(self._buffed)
+        fresh = self._top(self._fresh)
+        candidates = []
+        if buffed:
+            candidates.append((buffed[0] + self._bonus, buffed[1]))
+        if fresh:
+            candidates.append(fresh)
+        if not candidates:
+            return None
+        return self._birds[min(candidates)[1]]
+
 class GameState:
-    def __init__(self):
+    __slots__ = ("cash", "banked_cash", "feed", "eggs", "meat", "chickens", "graveyard",
+                 "_ghosts", "turn", "year", "season_index", "meat_harvested_this_year",
+                 "double_eggs_active", "egg_price_multiplier", "coop_level", "eggs_this_turn", "rng",
+                 "_ghosts_by_tier", "_ghost_counts")
+
+    def __init__(self, rng=None):
         self.cash = INITIAL_CASH
         self.banked_cash = 0
         self.feed = INITIAL_FEED
         self.eggs = 0
         self.meat = 0
         # Initial chickens get their base cash value as purchase price
-        self.chickens = [Chicken(c["breed"], c["tier"], CHICKEN_STATS[c["breed"]]["cash"]) for c in INITIAL_CHICKENS]
-        self.graveyard = [] # Stores fallen Chicken objects
-        self.ghost_chickens = [] # Stores GhostChicken objects
+        self.chickens = Flock(Chicken(c["breed"], c["tier"], CHICKEN_STATS[c["breed"]]["cash"]) for c in INITIAL_CHICKENS)
+        # Spirit ledger: the number of fallen chickens of each tier. Only the
+        # tier matters for ghost exchange, so the birds themselves are not kept.
+        self.graveyard = dict.fromkeys(GHOST_EXCHANGE_RATES, 0)
+        # Add and remove ghosts through add_ghost/remove_ghost so the per-tier
+        # queues and counts stay in sync. Ghosts are dict keys, in the order
+        # they appeared, so any one of them is removed in O(1).
+        self._ghosts = {}
+        self._ghosts_by_tier = {tier: deque() for tier in GHOST_EXCHANGE_RATES}
+        self._ghost_counts = dict.fromkeys(GHOST_EXCHANGE_RATES, 0)
         self.turn = 1
         self.year = 1
-        self.season = "Spring"
+        self.season_index = 0  # into RULES.season_names; the first season is Spring
         self.meat_harvested_this_year = 0
         self.double_eggs_active = False
         self.egg_price_multiplier = 1.0
         self.coop_level = 1
+        self.eggs_this_turn = 0
+        # Source of every random roll for this farm; simulations pass their own
+        # random.Random so each game has an independent, reproducible stream
+        self.rng = rng if rng is not None else random
+
+    @property
+    def season(self):
+        return RULES.season_names[self.season_index]
+
+    @season.setter
+    def season(self, name):
+        self.season_index = RULES.season_index[name]
 
     def get_coop_capacity(self):
-        return COOP_UPGRADES[self.coop_level]["capacity"]
+        return RULES.coop_capacity[self.coop_level]
 
     def add_chicken(self, breed, tier, purchase_price=None):
         if len(self.chickens) < self.get_coop_capacity():
@@ -119,19 +255,105 @@ class GameState:
             return True
         return False
 
+    @property
+    def ghost_chickens(self):
+        # Every ghost in the order they appeared; a live read-only view
+        return self._ghosts.keys()
+
+    @property
+    def ghost_counts(self):
+        # Ghosts per original tier, kept up to date on every add and remove
+        return self._ghost_counts
+
+    @property
+    def graveyard_counts(self):
+        # Fallen chickens per tier, i.e. the spirit ledger itself
+        return self.graveyard
+
+    def add_ghost(self, tier, count=1):
+        queue = self._ghosts_by_tier[tier]
+        for _ in range(count):
+            ghost = GhostChicken(tier)
+            self._ghosts[ghost] = None
+            queue.append(ghost)
+        self._ghost_counts[tier] += count
+
+    def remove_ghost(self, ghost):
+        del self._ghosts[ghost]
+        tier = ghost.original_tier
+        self._ghost_counts[tier] -= 1
+        # Queue entries are dropped lazily; compact once they are mostly stale
+        queue = self._ghosts_by_tier[tier]
+        if len(queue) > 2 * self._ghost_counts[tier] + 16:
+            self._ghosts_by_tier[tier] = deque(g for g in queue if g in self._ghosts)
+
+    def first_ghost(self, tier):
+        # The earliest ghost of `tier` still around, or None
+        queue = self._ghosts_by_tier[tier]
+        while queue and queue[0] not in self._ghosts:
+            queue.popleft()
+        return queue[0] if queue else None
+
+    def bury(self, chicken):
+        self.graveyard[chicken.tier] += 1
+
+    def take_spirits(self, tier, count):
+        taken = min(count, self.graveyard[tier])
+        self.graveyard[tier] -= taken
+        return taken
+
+    # A snapshot is a flat tuple of plain values: cheap to take, hashable and
+    # safe to keep around for undo or lookahead. The rng is not part of it.
+    def snapshot(self):
+        return (
+            self.cash, self.banked_cash, self.feed, self.eggs, self.meat,
+            self.turn, self.year, self.season_index, self.meat_harvested_this_year,
+            self.double_eggs_active, self.egg_price_multiplier, self.coop_level,
+            self.eggs_this_turn, self.chickens.health_bonus,
+            tuple((c.breed, c.tier, c.purchase_price, c.current_health) for c in self.chickens),
+            tuple(g.original_tier for g in self.ghost_chickens),
+            tuple(self.graveyard.items()),
+        )
+
+    def restore(self, snapshot):
+        (self.cash, self.banked_cash, self.feed, self.eggs, self.meat,
+         self.turn, self.year, self.season_index, self.meat_harvested_this_year,
+         self.double_eggs_active, self.egg_price_multiplier, self.coop_level,
+         self.eggs_this_turn, health_bonus, chickens, ghosts, graveyard) = snapshot
+        birds = []
+        for breed, tier, purchase_price, current_health in chickens:
+            chicken = Chicken(breed, tier, purchase_price)
+            chicken.current_health = current_health
+            birds.append(chicken)
+        self.chickens = Flock.restored(birds, health_bonus)
+        self._ghosts = {}
+        self._ghosts_by_tier = {tier: deque() for tier in GHOST_EXCHANGE_RATES}
+        self._ghost_counts = dict.fromkeys(GHOST_EXCHANGE_RATES, 0)
+        for tier in ghosts:
+            self.add_ghost(tier)
+        self.graveyard = dict(graveyard)
+
+    @classmethod
+    def from_snapshot(cls, snapshot, rng=None):
+        state = cls(rng)
+        state.restore(snapshot)
+        return state
+
     def next_turn(self):
         self.turn += 1
         if (self.turn - 1) % TURNS_PER_SEASON == 0:
-            current_season_index = list(SEASONS.keys()).index(self.season)
-            if current_season_index == 3:
-                self.season = "Spring"
+            self.season_index += 1
+            if self.season_index == len(RULES.season_names):
+                self.season_index = 0
                 self.year += 1
                 self.meat_harvested_this_year = 0
-            else:
-                self.season = list(SEASONS.keys())[current_season_index + 1]
+
+# The console front-end draws through one Screen, which only rewrites the
+# terminal rows that changed between frames
+SCREEN = Screen()
 
 def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
+    SCREEN.clear()
 
 def show_intro():
     clear_screen()
@@ -159,107 +381,175 @@ def show_intro():
     print("\nWhen your chickens die, their spirits linger. Collect enough spirits")
     print("to summon powerful Ghost Chickens with unique abilities.")
     print("\nGood luck, farmer!")
+    startup.first_screen("console intro")
     input("\nPress Enter to begin...")
 
-def display_game_state(state, messages):
-    clear_screen()
-    print("--- Poultry Geist ---")
-    print(f"Year: {state.year} | Turn: {state.turn} | Season: {state.season}")
-    print("--- Resources ---")
-    print(f"Cash: ${state.cash} | Banked: ${state.banked_cash}/{VICTORY_CASH} | Feed: {state.feed} | Eggs: {state.eggs} | Meat: {state.meat}")
-    print(f"Meat This Year: {state.meat_harvested_this_year}/{VICTORY_MEAT}")
-    print("--- Farm ---")
+MESSAGE_ROWS = 5
+CONSOLE_SAVE = "console"  # name of the console game's save in savegame.SAVE_DIR
+ACTION_MENU = [
+    "",
+    "--- Actions ---",
+    "1. Buy Chicken",
+    "2. Sell Chicken",
+    "3. Harvest Chicken for Meat",
+    "4. Buy Feed",
+    "5. Sell Eggs",
+    "6. Hatch Eggs",
+    "7. Bank Cash",
+    "8. Upgrade Coop",
+    "9. Manage Ghosts",
+    "10. Use Ghost Ability",
+    "11. Next Turn",
+]
+
+def list_lines(items, count, empty, limit):
+    # "  - item" rows for `count` items, cut short with a tally past `limit` rows
+    if not count:
+        return [f"  - {empty}"]
+    if count <= limit:
+        return [f"  - {item}" for item in items]
+    shown = max(1, limit - 1)
+    return [f"  - {item}" for item in islice(items, shown)] + [f"  ... and {count - shown} more"]
+
+def game_state_lines(state, messages, footer=(), height=None):
     coop_name = COOP_UPGRADES[state.coop_level]["name"]
-    print(f"{coop_name}: {len(state.chickens)}/{state.get_coop_capacity()}")
-    print("Chickens:")
-    if state.chickens:
-        for chicken in state.chickens:
-            print(f"  - {chicken}")
-    else:
-        print("  - No chickens.")
-    graveyard_counts = Counter(c.tier for c in state.graveyard)
-    print("Graveyard:")
-    print(f"  - Bronze: {graveyard_counts['Bronze']}, Silver: {graveyard_counts['Silver']}, Gold: {graveyard_counts['Gold']}")
-    print("Ghosts:")
-    if state.ghost_chickens:
-        for ghost in state.ghost_chickens:
-            print(f"  - {ghost}")
-    else:
-        print("  - No ghosts.")
-    print("-" * 20)
-    for msg in messages:
-        print(msg)
-    print("-" * 20)
+    graveyard_counts = state.graveyard_counts
+    top = [
+        "--- Poultry Geist ---",
+        f"Year: {state.year} | Turn: {state.turn} | Season: {state.season}",
+        "--- Resources ---",
+        f"Cash: ${state.cash} | Banked: ${state.banked_cash}/{VICTORY_CASH} | Feed: {state.feed} | Eggs: {state.eggs} | Meat: {state.meat}",
+        f"Meat This Year: {state.meat_harvested_this_year}/{VICTORY_MEAT}",
+        "--- Farm ---",
+        f"{coop_name}: {len(state.chickens)}/{state.get_coop_capacity()}",
+        "Chickens:",
+    ]
+    graveyard = [
+        "Graveyard:",
+        f"  - Bronze: {graveyard_counts['Bronze']}, Silver: {graveyard_counts['Silver']}, Gold: {graveyard_counts['Gold']}",
+        "Ghosts:",
+    ]
+    messages = list(messages)
+    if height is not None:
+        # A fixed-height message area keeps the menu on the same rows between frames
+        messages += [""] * (MESSAGE_ROWS - len(messages))
+    bottom = ["-" * 20] + messages + ["-" * 20] + list(footer)
+
+    # Long flock and ghost lists are shortened so the frame fits in `height` rows
+    chicken_limit, ghost_limit = len(state.chickens), len(state.ghost_chickens)
+    if height is not None:
+        room = max(2, height - len(top) - len(graveyard) - len(bottom))
+        ghost_limit = max(1, min(ghost_limit, room // 3))
+        chicken_limit = max(1, room - ghost_limit)
+    chicken_rows = list_lines(state.chickens, len(state.chickens), "No chickens.", chicken_limit)
+    ghost_rows = list_lines(state.ghost_chickens, len(state.ghost_chickens), "No ghosts.", ghost_limit)
+    return top + chicken_rows + graveyard + ghost_rows + bottom
+
+def display_game_state(state, messages, footer=()):
+    SCREEN.render(game_state_lines(state, messages, footer, SCREEN.frame_height()))
+
+def is_victory(state, eggs_this_turn):
+    return eggs_this_turn >= VICTORY_EGGS and state.banked_cash >= VICTORY_CASH and state.meat_harvested_this_year >= VICTORY_MEAT
+
+def is_bankrupt(state):
+    min_price = RULES.min_chicken_price
+    return not state.chickens and state.cash < min_price
+
+def game_outcome(state):
+    # "win", "bankrupt", or None while the game is still going
+    if is_victory(state, state.eggs_this_turn):
+        return "win"
+    if is_bankrupt(state):
+        return "bankrupt"
+    return None
 
 def check_victory_conditions(state, eggs_this_turn):
-    if eggs_this_turn >= VICTORY_EGGS and state.banked_cash >= VICTORY_CASH and state.meat_harvested_this_year >= VICTORY_MEAT:
+    if is_victory(state, eggs_this_turn):
         print("\nCongratulations! You have built a thriving poultry farm and won the game!")
         return True
     return False
 
 def check_game_over(state):
-    min_price = min(stats['cash'] for stats in CHICKEN_STATS.values())
-    if not state.chickens and state.cash < min_price:
+    if is_bankrupt(state):
         print("\n--- GAME OVER ---")
         print("You have no chickens and not enough cash to buy a new one.")
         print("Your farm has gone bankrupt.")
         return True
     return False
 
+# Event effects: the "effect" of an event in the rules names one of these
+# handlers, which apply it to the farm. Register more with @event_effect.
+EVENT_EFFECTS = {}
+
+def event_effect(name):
+    def register(handler):
+        EVENT_EFFECTS[name] = handler
+        return handler
+    return register
+
+@event_effect("lose_chicken")
 def lose_chicken(game_state, messages):
     if not game_state.chickens:
         return
 
-    for ghost in game_state.ghost_chickens:
-        if ghost.original_tier == "Bronze":
-            messages.append("A Bronze Ghost sacrificed itself to protect a chicken from dying!")
-            game_state.ghost_chickens.remove(ghost)
-            return
+    bronze_ghost = game_state.first_ghost("Bronze")
+    if bronze_ghost is not None:
+        messages.append("A Bronze Ghost sacrificed itself to protect a chicken from dying!")
+        game_state.remove_ghost(bronze_ghost)
+        return
 
-    weakest_chicken = min(game_state.chickens, key=lambda c: c.current_health)
+    weakest_chicken = game_state.chickens.weakest()
     game_state.chickens.remove(weakest_chicken)
-    game_state.graveyard.append(weakest_chicken)
+    game_state.bury(weakest_chicken)
     messages.append(f"A {weakest_chicken} has died!")
 
-def process_turn_start(game_state):
-    messages = []
-    game_state.egg_price_multiplier = 1.0
+@event_effect("gain_chicken")
+def gain_chicken(game_state, messages):
+    if game_state.add_chicken("Pearl Leghorn", "Bronze", CHICKEN_STATS["Pearl Leghorn"]["cash"]):
+        messages.append("A new Pearl Leghorn appeared!")
+    else:
+        messages.append("A new chicken appeared but your coop is full!")
+
+@event_effect("cash_bonus")
+def cash_bonus(game_state, messages):
+    game_state.cash += 10
 
-    gold_ghost_count = sum(1 for g in game_state.ghost_chickens if g.original_tier == "Gold")
+@event_effect("feed_bonus")
+def feed_bonus(game_state, messages):
+    game_state.feed += 10
+
+@event_effect("double_egg_value")
+def double_egg_value(game_state, messages):
+    game_state.egg_price_multiplier = 2.0
+
+# The turn pipeline runs as a fixed sequence of phases. Each phase is a
+# module-level function looked up at call time, so profiling.py can swap in
+# timed versions while it runs and put the plain ones back afterwards.
+
+def apply_ghost_health(game_state, messages):
+    gold_ghost_count = game_state.ghost_counts["Gold"]
     if gold_ghost_count > 0:
         messages.append(f"Your {gold_ghost_count} Gold Ghost(s) grant +{2*gold_ghost_count} health to all chickens.")
-    for chicken in game_state.chickens:
-        chicken.current_health = chicken.base_health + (2 * gold_ghost_count)
+    game_state.chickens.reset_health(2 * gold_ghost_count)
 
+def announce_season(game_state, messages):
     if (game_state.turn - 1) % TURNS_PER_SEASON == 0 and game_state.turn > 1:
         messages.append(f"--- {game_state.season.upper()} ---")
-        messages.append(SEASONS[game_state.season]["message"])
-
-    if random.random() < EVENT_CHANCE:
-        event, event_data = random.choice(list(EVENTS.items()))
-        messages.append(f"EVENT: {event} - {event_data['message']}")
-        effect = event_data['effect']
-        if effect == 'lose_chicken':
-            lose_chicken(game_state, messages)
-        elif effect == 'gain_chicken':
-            if game_state.add_chicken("Pearl Leghorn", "Bronze", CHICKEN_STATS["Pearl Leghorn"]["cash"]):
-                messages.append("A new Pearl Leghorn appeared!")
-            else:
-                messages.append("A new chicken appeared but your coop is full!")
-        elif effect == 'cash_bonus':
-            game_state.cash += 10
-        elif effect == 'feed_bonus':
-            game_state.feed += 10
-        elif effect == 'double_egg_value':
-            game_state.egg_price_multiplier = 2.0
+        messages.append(RULES.season_messages[game_state.season_index])
 
+def roll_event(game_state, messages):
+    if game_state.rng.random() < EVENT_CHANCE:
+        event = RULES.draw_event(game_state.season_index, game_state.rng.random())
+        if event is not None:
+            name, message, effect = RULES.event_entries[event]
+            messages.append(f"EVENT: {name} - {message}")
+            EVENT_EFFECTS[effect](game_state, messages)
+
+def produce_eggs(game_state, messages):
     egg_multiplier = 2.0 if game_state.double_eggs_active else 1.0
-    if game_state.season == "Summer":
-        egg_multiplier += SEASONS["Summer"]["egg_increase"]
-    if game_state.season == "Winter":
-        egg_multiplier -= SEASONS["Winter"]["egg_reduction"]
+    egg_multiplier += RULES.season_egg_delta[game_state.season_index]
 
-    bronze_ghost_count = sum(1 for g in game_state.ghost_chickens if g.original_tier == "Bronze")
+    bronze_ghost_count = game_state.ghost_counts["Bronze"]
     base_eggs = 0
     for chicken in game_state.chickens:
         bonus = 0
@@ -269,71 +559,288 @@ def process_turn_start(game_state):
 
     new_eggs = int(base_eggs * egg_multiplier)
     game_state.eggs += new_eggs
+    game_state.eggs_this_turn = new_eggs
     messages.append(f"Your chickens produced {new_eggs} eggs.")
     if game_state.double_eggs_active:
         messages.append("The Silver Ghost's power was consumed to double your egg production!")
         game_state.double_eggs_active = False
+    return new_eggs
 
+def process_turn_start(game_state):
+    messages = []
+    game_state.egg_price_multiplier = 1.0
+    apply_ghost_health(game_state, messages)
+    announce_season(game_state, messages)
+    roll_event(game_state, messages)
+    new_eggs = produce_eggs(game_state, messages)
     return messages, new_eggs
 
-def play_game():
-    game_state = GameState()
+# --- Headless Engine ---
+# Every player action is a plain function that applies the rules to a GameState
+# and returns the messages it produced. Nothing here prints, clears the screen or
+# waits for input, so the same rules can drive the console, the GUI and bots.
 
-    while True:
-        turn_messages, eggs_this_turn = process_turn_start(game_state)
+def get_chicken_price(state, breed):
+    price = RULES.breed_cash[RULES.breed_index[breed]]
+    price = int(price * RULES.season_chicken_price_factor[state.season_index])
+    return max(1, price)
+
+def get_feed_price(state):
+    return RULES.season_feed_price[state.season_index]
+
+def get_egg_price(state):
+    return int(1 * state.egg_price_multiplier)
+
+def get_hatch_rate(state):
+    return RULES.season_hatch_rate[state.season_index]
+
+def get_usable_ghosts(state):
+    return [g for g in state.ghost_chickens if g.original_tier != "Bronze"]
+
+def get_bronze_chickens(state):
+    return state.chickens.tier("Bronze")
+
+def buy_chicken(state, breed):
+    if breed not in CHICKEN_STATS:
+        return ["Invalid choice."]
+    cost = get_chicken_price(state, breed)
+    if state.cash < cost:
+        return ["Not enough cash."]
+    if not state.add_chicken(breed, CHICKEN_STATS[breed]["tier"], cost):
+        return ["Your coop is full!"]
+    state.cash -= cost
+    return [f"You bought a {breed} for ${cost}."]
+
+def sell_chicken(state, index):
+    if not state.chickens:
+        return ["You have no chickens to sell."]
+    if not 0 <= index < len(state.chickens):
+        return ["Invalid choice."]
+    sold_chicken = state.chickens.pop(index)
+    sale_price = sold_chicken.get_sale_price(state.season)
+    state.cash += sale_price
+    return [f"You sold a {sold_chicken} for ${sale_price}."]
+
+def harvest_chicken(state, index):
+    if not state.chickens:
+        return ["You have no chickens to harvest."]
+    if not 0 <= index < len(state.chickens):
+        return ["Invalid choice."]
+    harvested_chicken = state.chickens.pop(index)
+    state.bury(harvested_chicken)
+    meat_yield = harvested_chicken.meat_value
+    meat_bonus = RULES.season_meat_bonus[state.season_index]
+    if meat_bonus:
+        meat_yield = int(meat_yield * (1 + meat_bonus))
+    state.meat += meat_yield
+    state.meat_harvested_this_year += meat_yield
+    return [f"You harvested a {harvested_chicken} for {meat_yield} meat."]
+
+def buy_feed(state, amount):
+    if amount <= 0:
+        return ["Invalid amount."]
+    cost = amount * get_feed_price(state)
+    if state.cash < cost:
+        return ["Not enough cash."]
+    state.feed += amount
+    state.cash -= cost
+    return [f"You bought {amount} units of feed."]
+
+def sell_eggs(state, amount):
+    if state.eggs <= 0:
+        return ["You have no eggs to sell."]
+    if amount > state.eggs:
+        return ["You don't have that many eggs."]
+    if amount <= 0:
+        return []
+    earnings = amount * get_egg_price(state)
+    state.eggs -= amount
+    state.cash += earnings
+    return [f"You sold {amount} eggs for ${earnings}."]
+
+def hatch_eggs(state):
+    if state.eggs < HATCHING_COST:
+        return ["You don't have enough eggs to attempt hatching."]
+    state.eggs -= HATCHING_COST
+    if state.rng.random() >= get_hatch_rate(state):
+        return ["The egg didn't hatch."]
+    # Hatched chickens get base cash value as purchase price
+    if state.add_chicken("Pearl Leghorn", "Bronze", CHICKEN_STATS["Pearl Leghorn"]["cash"]):
+        return ["Success! A new Pearl Leghorn chick has hatched!"]
+    return ["The egg hatched, but your coop is full! The chick ran away."]
+
+def bank_cash(state, amount):
+    if amount > state.cash:
+        return ["You don't have that much cash."]
+    if amount <= 0:
+        return []
+    state.cash -= amount
+    state.banked_cash += amount
+    return [f"You banked ${amount}."]
+
+def upgrade_coop(state):
+    next_level = state.coop_level + 1
+    if next_level not in COOP_UPGRADES:
+        return ["Your coop is already max level!"]
+    upgrade_cost = COOP_UPGRADES[next_level]["cost"]
+    upgrade_name = COOP_UPGRADES[next_level]["name"]
+    if state.cash < upgrade_cost:
+        return [f"You don't have enough cash. The {upgrade_name} costs ${upgrade_cost}."]
+    state.cash -= upgrade_cost
+    state.coop_level = next_level
+    return [f"Congratulations! You've upgraded to the {upgrade_name}."]
+
+def exchange_ghost(state, tier):
+    if tier not in GHOST_EXCHANGE_RATES:
+        return ["Invalid choice."]
+    required = GHOST_EXCHANGE_RATES[tier]
+    if state.graveyard_counts[tier] < required:
+        return [f"Not enough {tier} spirits."]
+    state.take_spirits(tier, required)
+    state.add_ghost(tier)
+    return [f"You have created a {tier} Ghost!"]
+
+def exchange_all_ghosts(state):
+    # Convert every affordable set of spirits in one go
+    messages = []
+    for tier, required in GHOST_EXCHANGE_RATES.items():
+        ghosts = state.graveyard[tier] // required
+        if ghosts:
+            state.take_spirits(tier, ghosts * required)
+            state.add_ghost(tier, ghosts)
+            messages.append(f"You have created {ghosts} {tier} Ghost{'s' if ghosts > 1 else ''}!")
+    return messages or ["Not enough spirits to create a ghost."]
+
+def use_ghost_ability(state, ghost_index, chicken_index=None):
+    usable_ghosts = get_usable_ghosts(state)
+    if not usable_ghosts:
+        return ["No active ghost abilities available."]
+    if not 0 <= ghost_index < len(usable_ghosts):
+        return ["Invalid choice."]
+    selected_ghost = usable_ghosts[ghost_index]
+
+    if selected_ghost.original_tier == "Silver":
+        state.double_eggs_active = True
+        state.remove_ghost(selected_ghost)
+        return ["The Silver Ghost is consumed to double your egg production next turn."]
+
+    bronze_chickens = get_bronze_chickens(state)
+    if not bronze_chickens:
+        return ["You have no Bronze chickens to convert."]
+    if chicken_index is None or not 0 <= chicken_index < len(bronze_chickens):
+        return ["Invalid choice."]
+    chicken_to_convert = bronze_chickens[chicken_index]
+    state.chickens.remove(chicken_to_convert)
+    # Converted chickens get base cash value as purchase price
+    state.add_chicken("Duck", "Silver", CHICKEN_STATS["Duck"]["cash"])
+    state.remove_ghost(selected_ghost)
+    return [f"The Gold Ghost is consumed to transform your {chicken_to_convert.breed} into a Silver Duck!"]
+
+def get_feed_needed(state):
+    feed_consumption_multiplier = RULES.season_feed_multiplier[state.season_index]
+
+    silver_ghost_count = state.ghost_counts["Silver"]
+    feed_needed = 0
+    for chicken in state.chickens:
+        reduction = 0
+        if chicken.tier == "Silver" and silver_ghost_count > 0:
+            reduction = silver_ghost_count
+        consumption = max(0, chicken.feed_consumption - reduction)
+        feed_needed += int(consumption * feed_consumption_multiplier)
+    return feed_needed
+
+def consume_feed(state, messages):
+    feed_needed = get_feed_needed(state)
+    if state.feed >= feed_needed:
+        state.feed -= feed_needed
+        messages.append(f"Your chickens consumed {feed_needed} feed.")
+    else:
+        messages.append("Not enough feed! Your chickens are starving.")
+        lose_chicken(state, messages)
 
-        if check_victory_conditions(game_state, eggs_this_turn):
+def roll_illness(state, messages):
+    illness_chance = RULES.season_illness_chance[state.season_index]
+    if illness_chance and state.rng.random() < illness_chance:
+        messages.append("A winter illness is spreading...")
+        lose_chicken(state, messages)
+
+def end_turn(state):
+    messages = []
+    consume_feed(state, messages)
+    roll_illness(state, messages)
+    state.next_turn()
+    turn_messages, _ = process_turn_start(state)
+    messages.extend(turn_messages)
+    return messages
+
+# Actions are tuples of (name, *args), e.g. ("buy_chicken", "Duck") or ("sell_eggs", 4).
+ACTIONS = {
+    "buy_chicken": buy_chicken,
+    "sell_chicken": sell_chicken,
+    "harvest_chicken": harvest_chicken,
+    "buy_feed": buy_feed,
+    "sell_eggs": sell_eggs,
+    "hatch_eggs": hatch_eggs,
+    "bank_cash": bank_cash,
+    "upgrade_coop": upgrade_coop,
+    "exchange_ghost": exchange_ghost,
+    "exchange_all_ghosts": exchange_all_ghosts,
+    "use_ghost_ability": use_ghost_ability,
+    "end_turn": end_turn,
+}
+
+def apply_action(state, action):
+    name, *args = action
+    handler = ACTIONS.get(name)
+    if handler is None:
+        return ["Invalid action."]
+    return handler(state, *args)
+
+def preview_action(state, action, rng=None):
+    # What-if: apply an action to a copy of the state. Rolls come from `rng`
+    # (a fresh random.Random by default) so the real game's stream is untouched.
+    preview = GameState.from_snapshot(state.snapshot(), rng if rng is not None else random.Random())
+    messages = apply_action(preview, action)
+    return preview, messages
+
+def new_game(rng=None):
+    # A fresh farm with the first turn already started, ready for apply_action
+    state = GameState(rng)
+    messages, _ = process_turn_start(state)
+    return state, messages
+
+def play_game(session, turn_messages):
+    # Every action goes through the session so the farm can be resumed
+    game_state = session.state
+    act = session.apply
+
+    while True:
+        if is_victory(game_state, game_state.eggs_this_turn):
             display_game_state(game_state, turn_messages)
+            check_victory_conditions(game_state, game_state.eggs_this_turn)
             break
 
         while True:
-            display_game_state(game_state, turn_messages)
-            turn_messages = [] # Clear messages after displaying them once
-
-            if check_game_over(game_state):
+            if is_bankrupt(game_state):
+                display_game_state(game_state, turn_messages)
+                check_game_over(game_state)
                 return
 
-            print("\n--- Actions ---")
-            print("1. Buy Chicken")
-            print("2. Sell Chicken")
-            print("3. Harvest Chicken for Meat")
-            print("4. Buy Feed")
-            print("5. Sell Eggs")
-            print("6. Hatch Eggs")
-            print("7. Bank Cash")
-            print("8. Upgrade Coop")
-            print("9. Manage Ghosts")
-            print("10. Use Ghost Ability")
-            print("11. Next Turn")
+            display_game_state(game_state, turn_messages, ACTION_MENU)
+            turn_messages = [] # Clear messages after displaying them once
             action = input("Choose an action: ")
 
             if action == "1":
                 print("\n--- Market ---")
                 for i, (breed, stats) in enumerate(CHICKEN_STATS.items()):
-                    price = stats['cash']
-                    if game_state.season == "Spring":
-                        price = int(price * (1 - SEASONS["Spring"]["new_chicken_discount"]))
-                    price = max(1, price)
-                    print(f"{i+1}. {stats['tier']} {breed} - ${price}")
+                    print(f"{i+1}. {stats['tier']} {breed} - ${get_chicken_price(game_state, breed)}")
                 print("0. Go Back")
                 try:
                     choice = int(input("Choose a chicken to buy: "))
                     if choice == 0:
                         continue
                     breed_to_buy = list(CHICKEN_STATS.keys())[choice - 1]
-                    cost = CHICKEN_STATS[breed_to_buy]["cash"]
-                    if game_state.season == "Spring":
-                        cost = int(cost * (1 - SEASONS["Spring"]["new_chicken_discount"]))
-                    cost = max(1, cost)
-
-                    if game_state.cash >= cost:
-                        if game_state.add_chicken(breed_to_buy, CHICKEN_STATS[breed_to_buy]["tier"], cost):
-                            game_state.cash -= cost
-                            turn_messages.append(f"You bought a {breed_to_buy} for ${cost}.")
-                        else:
-                            turn_messages.append("Your coop is full!")
-                    else:
-                        turn_messages.append("Not enough cash.")
+                    turn_messages += act(("buy_chicken", breed_to_buy))
                 except (ValueError, IndexError):
                     turn_messages.append("Invalid choice.")
 
@@ -341,6 +848,7 @@ def play_game():
                 if not game_state.chickens:
                     turn_messages.append("You have no chickens to sell.")
                 else:
+                    SCREEN.note_lines(len(game_state.chickens) + 4)
                     print("\n--- Your Chickens ---")
                     for i, chicken in enumerate(game_state.chickens):
                         sale_price = chicken.get_sale_price(game_state.season)
@@ -350,17 +858,15 @@ def play_game():
                         choice = int(input("Choose a chicken to sell: "))
                         if choice == 0:
                             continue
-                        sold_chicken = game_state.chickens.pop(choice - 1)
-                        sale_price = sold_chicken.get_sale_price(game_state.season)
-                        game_state.cash += sale_price
-                        turn_messages.append(f"You sold a {sold_chicken} for ${sale_price}.")
-                    except (ValueError, IndexError):
+                        turn_messages += act(("sell_chicken", choice - 1))
+                    except ValueError:
                         turn_messages.append("Invalid choice.")
 
             elif action == "3":
                 if not game_state.chickens:
                     turn_messages.append("You have no chickens to harvest.")
                 else:
+                    SCREEN.note_lines(len(game_state.chickens) + 4)
                     print("\n--- Harvest a Chicken ---")
                     for i, chicken in enumerate(game_state.chickens):
                         print(f"{i+1}. {chicken}")
@@ -369,30 +875,14 @@ def play_game():
                         choice = int(input("Choose a chicken to harvest: "))
                         if choice == 0:
                             continue
-                        harvested_chicken = game_state.chickens.pop(choice - 1)
-                        game_state.graveyard.append(harvested_chicken)
-                        meat_yield = harvested_chicken.meat_value
-                        if game_state.season == "Fall":
-                            meat_yield = int(meat_yield * (1 + SEASONS["Fall"]["meat_bonus"]))
-                        game_state.meat += meat_yield
-                        game_state.meat_harvested_this_year += meat_yield
-                        turn_messages.append(f"You harvested a {harvested_chicken} for {meat_yield} meat.")
-                    except (ValueError, IndexError):
+                        turn_messages += act(("harvest_chicken", choice - 1))
+                    except ValueError:
                         turn_messages.append("Invalid choice.")
 
             elif action == "4":
-                feed_price = 1.0
-                if game_state.season == "Winter":
-                    feed_price += SEASONS["Winter"]["feed_cost_increase"]
                 try:
-                    amount = int(input(f"How much feed to buy? (${feed_price:.2f} per unit): "))
-                    cost = amount * feed_price
-                    if amount > 0 and game_state.cash >= cost:
-                        game_state.feed += amount
-                        game_state.cash -= cost
-                        turn_messages.append(f"You bought {amount} units of feed.")
-                    else:
-                        turn_messages.append("Invalid amount or not enough cash.")
+                    amount = int(input(f"How much feed to buy? (${get_feed_price(game_state):.2f} per unit): "))
+                    turn_messages += act(("buy_feed", amount))
                 except ValueError:
                     turn_messages.append("Invalid input.")
 
@@ -400,51 +890,28 @@ def play_game():
                 if game_state.eggs <= 0:
                     turn_messages.append("You have no eggs to sell.")
                 else:
-                    egg_price = int(1 * game_state.egg_price_multiplier)
-                    print(f"\nYou have {game_state.eggs} eggs. Current price: ${egg_price} per egg.")
+                    print(f"\nYou have {game_state.eggs} eggs. Current price: ${get_egg_price(game_state)} per egg.")
                     try:
                         amount_to_sell = int(input(f"How many eggs to sell? (0 to cancel): "))
-                        if 0 < amount_to_sell <= game_state.eggs:
-                            earnings = amount_to_sell * egg_price
-                            game_state.eggs -= amount_to_sell
-                            game_state.cash += earnings
-                            turn_messages.append(f"You sold {amount_to_sell} eggs for ${earnings}.")
-                        elif amount_to_sell > game_state.eggs:
-                            turn_messages.append("You don't have that many eggs.")
+                        turn_messages += act(("sell_eggs", amount_to_sell))
                     except ValueError:
                         turn_messages.append("Invalid amount.")
 
             elif action == "6":
-                hatch_rate = HATCHING_SUCCESS_RATE
-                if game_state.season == "Spring":
-                    hatch_rate += SEASONS["Spring"]["hatching_bonus"]
                 print(f"\nIt costs {HATCHING_COST} eggs to attempt to hatch a new chick.")
-                print(f"Current success rate: {hatch_rate:.0%}")
+                print(f"Current success rate: {get_hatch_rate(game_state):.0%}")
                 if game_state.eggs < HATCHING_COST:
                     turn_messages.append("You don't have enough eggs to attempt hatching.")
                 else:
                     confirm = input("Attempt to hatch? (y/n): ").lower()
                     if confirm == 'y':
-                        game_state.eggs -= HATCHING_COST
-                        if random.random() < hatch_rate:
-                            # Hatched chickens get base cash value as purchase price
-                            if game_state.add_chicken("Pearl Leghorn", "Bronze", CHICKEN_STATS["Pearl Leghorn"]["cash"]):
-                                turn_messages.append("Success! A new Pearl Leghorn chick has hatched!")
-                            else:
-                                turn_messages.append("The egg hatched, but your coop is full! The chick ran away.")
-                        else:
-                            turn_messages.append("The egg didn't hatch.")
+                        turn_messages += act(("hatch_eggs",))
 
             elif action == "7":
                 print(f"\nYou have ${game_state.cash} to bank.")
                 try:
                     amount_to_bank = int(input("How much to bank? (0 to cancel): "))
-                    if 0 < amount_to_bank <= game_state.cash:
-                        game_state.cash -= amount_to_bank
-                        game_state.banked_cash += amount_to_bank
-                        turn_messages.append(f"You banked ${amount_to_bank}.")
-                    elif amount_to_bank > game_state.cash:
-                        turn_messages.append("You don't have that much cash.")
+                    turn_messages += act(("bank_cash", amount_to_bank))
                 except ValueError:
                     turn_messages.append("Invalid amount.")
 
@@ -461,69 +928,31 @@ def play_game():
                     else:
                         confirm = input("Confirm upgrade? (y/n): ").lower()
                         if confirm == 'y':
-                            game_state.cash -= upgrade_cost
-                            game_state.coop_level = next_level
-                            turn_messages.append(f"Congratulations! You've upgraded to the {upgrade_name}.")
+                            turn_messages += act(("upgrade_coop",))
 
             elif action == "9":
-                graveyard_counts = Counter(c.tier for c in game_state.graveyard)
+                graveyard_counts = game_state.graveyard_counts
                 print("\n--- Manage Ghosts ---")
                 print("Exchange spirits of fallen chickens for Ghost Chickens.")
                 print(f"1. Exchange {GHOST_EXCHANGE_RATES['Bronze']} Bronze spirits for 1 Bronze Ghost (You have: {graveyard_counts['Bronze']})")
                 print(f"2. Exchange {GHOST_EXCHANGE_RATES['Silver']} Silver spirits for 1 Silver Ghost (You have: {graveyard_counts['Silver']})")
                 print(f"3. Exchange {GHOST_EXCHANGE_RATES['Gold']} Gold spirit for 1 Gold Ghost (You have: {graveyard_counts['Gold']})")
+                print("4. Exchange all affordable spirits")
                 print("0. Go Back")
                 choice = input("Choose an option: ")
-
-                if choice == "1":
-                    if graveyard_counts['Bronze'] >= GHOST_EXCHANGE_RATES['Bronze']:
-                        removed_count = 0
-                        new_graveyard = []
-                        for chicken in game_state.graveyard:
-                            if chicken.tier == 'Bronze' and removed_count < GHOST_EXCHANGE_RATES['Bronze']:
-                                removed_count += 1
-                            else:
-                                new_graveyard.append(chicken)
-                        game_state.graveyard = new_graveyard
-                        game_state.ghost_chickens.append(GhostChicken("Bronze"))
-                        turn_messages.append("You have created a Bronze Ghost!")
-                    else:
-                        turn_messages.append("Not enough Bronze spirits.")
-                elif choice == "2":
-                    if graveyard_counts['Silver'] >= GHOST_EXCHANGE_RATES['Silver']:
-                        removed_count = 0
-                        new_graveyard = []
-                        for chicken in game_state.graveyard:
-                            if chicken.tier == 'Silver' and removed_count < GHOST_EXCHANGE_RATES['Silver']:
-                                removed_count += 1
-                            else:
-                                new_graveyard.append(chicken)
-                        game_state.graveyard = new_graveyard
-                        game_state.ghost_chickens.append(GhostChicken("Silver"))
-                        turn_messages.append("You have created a Silver Ghost!")
-                    else:
-                        turn_messages.append("Not enough Silver spirits.")
-                elif choice == "3":
-                    if graveyard_counts['Gold'] >= GHOST_EXCHANGE_RATES['Gold']:
-                        removed_count = 0
-                        new_graveyard = []
-                        for chicken in game_state.graveyard:
-                            if chicken.tier == 'Gold' and removed_count < GHOST_EXCHANGE_RATES['Gold']:
-                                removed_count += 1
-                            else:
-                                new_graveyard.append(chicken)
-                        game_state.graveyard = new_graveyard
-                        game_state.ghost_chickens.append(GhostChicken("Gold"))
-                        turn_messages.append("You have created a Gold Ghost!")
-                    else:
-                        turn_messages.append("Not enough Gold spirits.")
+                tier = {"1": "Bronze", "2": "Silver", "3": "Gold"}.get(choice)
+                if tier:
+                    turn_messages += act(("exchange_ghost", tier))
+                elif choice == "4":
+                    turn_messages += act(("exchange_all_ghosts",))
 
             elif action == "10":
                 print("\n--- Use Ghost Ability ---")
-                usable_ghosts = [g for g in game_state.ghost_chickens if g.original_tier != "Bronze"]
+                usable_ghosts = get_usable_ghosts(game_state)
                 if not usable_ghosts:
                     turn_messages.append("No active ghost abilities available.")
                 else:
+                    SCREEN.note_lines(len(usable_ghosts) + 4)
                     for i, ghost in enumerate(usable_ghosts):
                         if ghost.original_tier == "Silver":
                             print(f"{i+1}. {ghost.original_tier} Ghost - Sacrifice to double egg production next turn.")
@@ -534,68 +963,59 @@ def play_game():
                         choice = int(input("Choose an ability to use: "))
                         if choice == 0:
                             continue
+                        if not 0 < choice <= len(usable_ghosts):
+                            raise IndexError
                         selected_ghost = usable_ghosts[choice - 1]
 
                         if selected_ghost.original_tier == "Silver":
-                            game_state.double_eggs_active = True
-                            game_state.ghost_chickens.remove(selected_ghost)
-                            turn_messages.append("The Silver Ghost is consumed to double your egg production next turn.")
+                            turn_messages += act(("use_ghost_ability", choice - 1))
 
                         elif selected_ghost.original_tier == "Gold":
-                            bronze_chickens = [c for c in game_state.chickens if c.tier == "Bronze"]
+                            bronze_chickens = get_bronze_chickens(game_state)
                             if not bronze_chickens:
                                 turn_messages.append("You have no Bronze chickens to convert.")
                             else:
+                                SCREEN.note_lines(len(usable_ghosts) + len(bronze_chickens) + 8)
                                 print("\n--- Convert a Chicken ---")
                                 for i, chicken in enumerate(bronze_chickens):
                                     print(f"{i+1}. {chicken}")
                                 print("0. Go Back")
                                 convert_choice = int(input("Choose a Bronze chicken to convert: "))
                                 if convert_choice != 0:
-                                    chicken_to_convert = bronze_chickens[convert_choice - 1]
-                                    game_state.chickens.remove(chicken_to_convert)
-                                    # Converted chickens get base cash value as purchase price
-                                    game_state.add_chicken("Duck", "Silver", CHICKEN_STATS["Duck"]["cash"])
-                                    game_state.ghost_chickens.remove(selected_ghost)
-                                    turn_messages.append(f"The Gold Ghost is consumed to transform your {chicken_to_convert.breed} into a Silver Duck!")
+                                    turn_messages += act(("use_ghost_ability", choice - 1, convert_choice - 1))
 
                     except (ValueError, IndexError):
                         turn_messages.append("Invalid choice.")
 
             elif action == "11":
-                feed_consumption_multiplier = 1.0
-                if game_state.season == "Summer":
-                    feed_consumption_multiplier += SEASONS["Summer"]["feed_increase"]
-
-                silver_ghost_count = sum(1 for g in game_state.ghost_chickens if g.original_tier == "Silver")
-                feed_needed = 0
-                for chicken in game_state.chickens:
-                    reduction = 0
-                    if chicken.tier == "Silver" and silver_ghost_count > 0:
-                        reduction = silver_ghost_count
-                    consumption = max(0, chicken.feed_consumption - reduction)
-                    feed_needed += int(consumption * feed_consumption_multiplier)
-
-                if game_state.feed >= feed_needed:
-                    game_state.feed -= feed_needed
-                    turn_messages.append(f"Your chickens consumed {feed_needed} feed.")
-                else:
-                    turn_messages.append("Not enough feed! Your chickens are starving.")
-                    lose_chicken(game_state, turn_messages)
-
-                if game_state.season == "Winter" and random.random() < SEASONS["Winter"]["illness_chance"]:
-                    turn_messages.append("A winter illness is spreading...")
-                    lose_chicken(game_state, turn_messages)
-
-                game_state.next_turn()
+                turn_messages = act(("end_turn",))
                 break
             else:
                 turn_messages.append("Invalid action.")
 
+def start_session():
+    # Offer to resume the saved farm, if there is one; otherwise start afresh
+    from savegame import Session, SaveError, has_save
+    if has_save(CONSOLE_SAVE):
+        if input("\nResume your saved farm? (y/n): ").lower() == "y":
+            try:
+                return Session.resume(CONSOLE_SAVE)
+            except (OSError, SaveError) as e:
+                print(f"Your saved farm could not be loaded ({e}). Starting a new one.")
+    game_state, turn_messages = new_game()
+    return Session(CONSOLE_SAVE, game_state), turn_messages
+
 def main():
     show_intro()
     while True:
-        play_game()
+        session, turn_messages = start_session()
+        try:
+            play_game(session, turn_messages)
+        except (KeyboardInterrupt, EOFError):
+            session.close()
+            print("\nYour farm has been saved.")
+            return
+        session.discard()  # the game is over, nothing to resume
         while True:
             play_again = input("\nPlay again? (y/n): ").lower()
             if play_again in ["y", "n"]:
@@ -605,4 +1025,7 @@ def main():
     print("\nThank you for playing Poultry Geist!")
 
 if __name__ == "__main__":
+    # savegame imports this module as "main"; make that the running script
+    # rather than a second copy
+    sys.modules.setdefault("main", sys.modules[__name__])
     main()
@@ -0,0 +1,226 @@
+"""Exact odds for a farm left to run on its own.
+
+Some balance questions have exact answers: the chance a flock comes through
+a Winter, or the eggs it lays over a Summer with the ghosts it has. This
+module computes them instead of sampling. When the player does nothing but
+end turns, a farm is a Markov chain. Its random steps are the event roll,
+which draws with the season's event weights and EVENT_CHANCE, and the
+season's illness roll. Feed use, deaths (lose_chicken, Bronze ghost
+sacrifices included) and egg production follow from those rolls. The
+evaluator feeds every outcome of each roll to the engine's own phases
+through a scripted rng, so the chain follows the real rules.
+
+A turn is made of two halves: its start (health reset, event, eggs) and its
+end (feed, illness, next turn). ``Evaluator`` computes the joint
+distribution of deaths and eggs laid over a number of halves by dynamic
+programming. Farms are reduced to the values that can still change the
+answer, and each (farm, halves left) result is memoized, so farms reached
+by different paths are only solved once:
+
+    python markov.py --season Winter --chickens "Duck,Pearl Leghorn,Pearl Leghorn" --feed 40
+    python markov.py --season Summer --chickens "Buff Orpington,Duck" --ghosts Bronze,Bronze
+"""
+
+import argparse
+import json
+import time
+
+import main as engine
+from main import GameState
+import solver
+from solver import ScriptedRNG
+
+
+def farm_key(state):
+    # A snapshot with everything that cannot change deaths or eggs zeroed:
+    # money, stock, meat, the year and the graveyard. What a bird cost does
+    # not matter either, but its current health does, because a bird added
+    # since the last Gold ghost reset is the first to die.
+    return (
+        0, 0, state.feed, 0, 0,
+        (state.turn - 1) % engine.TURNS_PER_SEASON + 1, 1, state.season_index, 0,
+        state.double_eggs_active, 1.0, state.coop_level, 0, state.chickens.health_bonus,
+        tuple((c.breed, c.tier, None, c.current_health) for c in state.chickens),
+        tuple(sorted(g.original_tier for g in state.ghost_chickens)),
+        tuple((tier, 0) for tier in state.graveyard),
+    )
+
+
+# --- Half turns ---
+# Each half is (roll outcomes, apply). The outcomes are (probability,
+# scripted rolls) for every way the half's rolls can come out, in draw order,
+# from the same chance nodes the solver expands. The start half runs after
+# next_turn, so its season is already the one the events are drawn in.
+
+def start_outcomes(state):
+    return solver.event_outcomes(state.season_index)
+
+def apply_start(state):
+    engine.process_turn_start(state)
+
+def end_outcomes(state):
+    return solver.illness_outcomes(state)
+
+def apply_end(state):
+    messages = []
+    engine.consume_feed(state, messages)
+    engine.roll_illness(state, messages)
+    state.next_turn()
+
+START, END = 0, 1
+# How far a half turn's branch probabilities may drift from summing to 1
+PROBABILITY_TOLERANCE = 1e-9
+HALVES = {START: (start_outcomes, apply_start), END: (end_outcomes, apply_end)}
+
+
+class Evaluator:
+    def __init__(self):
+        self.rules = engine.RULES
+        self.transitions = {}  # (key, half) -> [(probability, next key, deaths, eggs)]
+        self.results = {}  # (key, half, halves left) -> {(deaths, eggs): probability}
+
+    def check_rules(self):
+        # Memoized answers only hold for the rules they were computed under
+        if engine.RULES is not self.rules:
+            self.rules = engine.RULES
+            self.transitions.clear()
+            self.results.clear()
+
+    def step(self, key, half):
+        # Distribution of the farm after one half turn, with the birds that
+        # died and the eggs laid along the way. Roll outcomes that leave the
+        # same farm are merged.
+        cached = self.transitions.get((key, half))
+        if cached is not None:
+            return cached
+        outcomes, apply = HALVES[half]
+        branches = outcomes(GameState.from_snapshot(key))
+        total = sum(probability for probability, _ in branches)
+        if abs(total - 1.0) > PROBABILITY_TOLERANCE:
+            raise ValueError(f"half-turn outcomes sum to {total}, not 1")
+        merged = {}
+        for probability, rolls in branches:
+            state = GameState.from_snapshot(key, ScriptedRNG(rolls))
+            apply(state)
+            deaths = sum(state.graveyard.values())
+            eggs = state.eggs_this_turn if half == START else 0
+            child = (farm_key(state), deaths, eggs)
+            merged[child] = merged.get(child, 0.0) + probability
+        result = [(p, child, deaths, eggs) for (child, deaths, eggs), p in merged.items()]
+        self.transitions[(key, half)] = result
+        return result
+
+    def distribution(self, key, half, halves):
+        # {(deaths, eggs): probability} over the next `halves` half turns,
+        # starting with `half`
+        if halves == 0:
+            return {(0, 0): 1.0}
+        cached = self.results.get((key, half, halves))
+        if cached is not None:
+            return cached
+        result = {}
+        for p, child, deaths, eggs in self.step(key, half):
+            for (later_deaths, later_eggs), q in self.distribution(child, 1 - half, halves - 1).items():
+                outcome = (deaths + later_deaths, eggs + later_eggs)
+                result[outcome] = result.get(outcome, 0.0) + p * q
+        self.results[(key, half, halves)] = result
+        return result
+
+    def evaluate(self, state, turns, at_turn_start=False):
+        # Outcome of the next `turns` turns. A farm as the player sees it has
+        # already started its turn, so each turn is an end_turn: this turn's
+        # end and the next one's start. With at_turn_start the farm's turn has
+        # not started yet, and each turn runs from its start to its end.
+        self.check_rules()
+        half = START if at_turn_start else END
+        return Outcome(self.distribution(farm_key(state), half, 2 * turns))
+
+    def stats(self):
+        return {"farms": len({key for key, _ in self.transitions}), "results": len(self.results)}
+
+
+class Outcome:
+    def __init__(self, distribution):
+        self.distribution = distribution  # {(deaths, eggs): probability}
+
+    def marginal(self, index):
+        result = {}
+        for outcome, p in self.distribution.items():
+            result[outcome[index]] = result.get(outcome[index], 0.0) + p
+        return dict(sorted(result.items()))
+
+    def deaths(self):
+        return self.marginal(0)
+
+    def eggs(self):
+        return self.marginal(1)
+
+    def survival_probability(self, max_deaths=0):
+        # Chance no more than max_deaths birds die; with the default, that the
+        # whole flock makes it
+        return sum(p for (deaths, _), p in self.distribution.items() if deaths <= max_deaths)
+
+    def expected_deaths(self):
+        return sum(deaths * p for (deaths, _), p in self.distribution.items())
+
+    def expected_eggs(self):
+        return sum(eggs * p for (_, eggs), p in self.distribution.items())
+
+    def to_json(self):
+        return {
+            "survival_probability": self.survival_probability(),
+            "expected_deaths": self.expected_deaths(),
+            "expected_eggs": self.expected_eggs(),
+            "deaths": self.deaths(),
+            "eggs": self.eggs(),
+        }
+
+
+def season_farm(season, chickens, ghosts=(), feed=None, coop_level=1):
+    # A farm at the top of the first turn of `season`, its start not yet run
+    state = GameState()
+    state.season = season
+    state.turn = state.season_index * engine.TURNS_PER_SEASON + 1
+    state.feed = engine.INITIAL_FEED if feed is None else feed
+    state.coop_level = coop_level
+    state.chickens = engine.Flock(engine.Chicken(breed, engine.CHICKEN_STATS[breed]["tier"]) for breed in chickens)
+    for tier in ghosts:
+        state.add_ghost(tier)
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact survival and egg odds for a Poultry Geist farm left to run.")
+    parser.add_argument("--season", default="Spring", help="season to start at (default: Spring)")
+    parser.add_argument("--turns", type=int, default=None, help="turns to evaluate (default: the whole season)")
+    parser.add_argument("--chickens", default="Pearl Leghorn,Pearl Leghorn", help="comma-separated breeds")
+    parser.add_argument("--ghosts", default="", help="comma-separated ghost tiers, e.g. Bronze,Gold")
+    parser.add_argument("--feed", type=int, default=None)
+    parser.add_argument("--coop-level", type=int, default=1)
+    args = parser.parse_args()
+
+    chickens = [breed.strip() for breed in args.chickens.split(",") if breed.strip()]
+    ghosts = [tier.strip() for tier in args.ghosts.split(",") if tier.strip()]
+    if args.season not in engine.RULES.season_index:
+        parser.error(f"unknown season {args.season!r}; expected one of {list(engine.RULES.season_names)}")
+    for breed in chickens:
+        if breed not in engine.CHICKEN_STATS:
+            parser.error(f"unknown breed {breed!r}; expected one of {sorted(engine.CHICKEN_STATS)}")
+    for tier in ghosts:
+        if tier not in engine.GHOST_EXCHANGE_RATES:
+            parser.error(f"unknown ghost tier {tier!r}; expected one of {sorted(engine.GHOST_EXCHANGE_RATES)}")
+    if args.coop_level not in engine.COOP_UPGRADES:
+        parser.error(f"unknown coop level {args.coop_level}")
+
+    turns = args.turns if args.turns is not None else engine.TURNS_PER_SEASON
+    state = season_farm(args.season, chickens, ghosts, args.feed, args.coop_level)
+    evaluator = Evaluator()
+    start = time.perf_counter()
+    outcome = evaluator.evaluate(state, turns, at_turn_start=True)
+    elapsed = time.perf_counter() - start
+    report = {"season": args.season, "turns": turns, **outcome.to_json(),
+              "elapsed_ms": elapsed * 1000, **evaluator.stats()}
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Parallel Monte Carlo runner for headless games.
+
+Games are split into fixed-size chunks that are spread over a process pool.
+Game ``i`` always uses seed ``game_seed(seed, i)`` and chunks are merged in
+chunk order, so the report is identical whatever the number of workers.
+
+    python montecarlo.py --games 100000 --workers 64 --seed 1
+"""
+
+import argparse
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from profiling import TurnProfiler
+from simulate import MAX_TURNS, greedy_policy, run_game, game_seed
+
+CHUNK_SIZE = 250
+TRAJECTORY_FIELDS = ("cash", "feed", "eggs", "meat", "flock")
+
+def empty_report():
+    return {
+        "games": 0,
+        "outcomes": Counter(),
+        "turns_to_victory": Counter(),
+        # Per turn: number of games still running and the summed resources
+        "alive": [],
+        "totals": [],
+        # Per-phase turn pipeline timings, when profiling
+        "profile": None,
+    }
+
+def merge_reports(into, other):
+    into["games"] += other["games"]
+    into["outcomes"].update(other["outcomes"])
+    into["turns_to_victory"].update(other["turns_to_victory"])
+    for turn, (alive, totals) in enumerate(zip(other["alive"], other["totals"])):
+        if turn == len(into["alive"]):
+            into["alive"].append(0)
+            into["totals"].append([0] * len(TRAJECTORY_FIELDS))
+        into["alive"][turn] += alive
+        into["totals"][turn] = [a + b for a, b in zip(into["totals"][turn], totals)]
+    if other["profile"] is not None:
+        profiler = TurnProfiler()
+        for profile in (into["profile"], other["profile"]):
+            if profile is not None:
+                profiler.merge(profile)
+        into["profile"] = profiler.snapshot()
+    return into
+
+def run_chunk(seed, start, stop, policy=greedy_policy, max_turns=MAX_TURNS, profile=False):
+    report = empty_report()
+    profiler = TurnProfiler()
+    if profile:
+        profiler.enable()
+    try:
+        for index in range(start, stop):
+            result = run_game(game_seed(seed, index), policy, max_turns, record=True)
+            game = empty_report()
+            game["games"] = 1
+            game["outcomes"][result["outcome"]] += 1
+            if result["outcome"] == "win":
+                game["turns_to_victory"][result["turns"]] += 1
+            game["alive"] = [1] * len(result["trajectory"])
+            game["totals"] = [list(row) for row in result["trajectory"]]
+            merge_reports(report, game)
+    finally:
+        profiler.disable()
+    if profile:
+        report["profile"] = profiler.snapshot()
+    return report
+
+def run_batch(games, seed=0, policy=greedy_policy, max_turns=MAX_TURNS, workers=None, chunk_size=CHUNK_SIZE,
+              profile=False):
+    chunks = [(start, min(start + chunk_size, games)) for start in range(0, games, chunk_size)]
+    report = empty_report()
+    if workers == 1:
+        partials = (run_chunk(seed, start, stop, policy, max_turns, profile) for start, stop in chunks)
+        for partial in partials:
+            merge_reports(report, partial)
+        return summarize(report)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_chunk, seed, start, stop, policy, max_turns, profile) for start, stop in chunks]
+        # Merge in chunk order, never completion order, to keep float sums stable
+        for future in futures:
+            merge_reports(report, future.result())
+    return summarize(report)
+
+def summarize(report):
+    games = report["games"]
+    outcomes = report["outcomes"]
+    trajectory = {field: [] for field in TRAJECTORY_FIELDS}
+    for alive, totals in zip(report["alive"], report["totals"]):
+        for field, total in zip(TRAJECTORY_FIELDS, totals):
+            trajectory[field].append(total / alive)
+    summary = {
+        "games": games,
+        "wins": outcomes["win"],
+        "bankruptcies": outcomes["bankrupt"],
+        "timeouts": outcomes["timeout"],
+        "win_rate": outcomes["win"] / games if games else 0.0,
+        "turns_to_victory": dict(sorted(report["turns_to_victory"].items())),
+        "games_alive": report["alive"],
+        "mean_trajectory": trajectory,
+    }
+    if report["profile"] is not None:
+        summary["profile"] = report["profile"]
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Run simulated Poultry Geist games in parallel.")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--max-turns", type=int, default=MAX_TURNS)
+    parser.add_argument("--profile", action="store_true", help="time each phase of the turn pipeline")
+    args = parser.parse_args()
+    report = run_batch(args.games, args.seed, max_turns=args.max_turns, workers=args.workers, profile=args.profile)
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
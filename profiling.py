@@ -0,0 +1,108 @@
+"""Opt-in timing of the turn pipeline, phase by phase.
+
+While a ``TurnProfiler`` is enabled, each phase of ``process_turn_start`` and
+``end_turn`` in main.py (and ``GameState.next_turn``) is replaced by a wrapper
+that counts calls and adds up nanoseconds spent in it. Disabling puts the plain
+functions back, so games that don't profile run exactly the code they always
+did.
+
+    with TurnProfiler() as profiler:
+        run_game(1)
+    print(profiler.to_json())
+
+Timings include the phases a phase calls; ``roll_event`` covers the event
+effect, ``consume_feed`` and ``roll_illness`` cover any chicken they kill.
+"""
+
+import json
+import time
+
+import main
+
+# (label, owner, attribute) for every timed phase, in pipeline order
+PHASES = (
+    ("ghost_health", main, "apply_ghost_health"),
+    ("season_announcement", main, "announce_season"),
+    ("event", main, "roll_event"),
+    ("egg_production", main, "produce_eggs"),
+    ("feed", main, "consume_feed"),
+    ("illness", main, "roll_illness"),
+    ("next_turn", main.GameState, "next_turn"),
+)
+
+
+class TurnProfiler:
+    def __init__(self):
+        self.calls = {label: 0 for label, _, _ in PHASES}
+        self.nanoseconds = {label: 0 for label, _, _ in PHASES}
+        self.originals = None
+
+    @property
+    def enabled(self):
+        return self.originals is not None
+
+    def _timed(self, label, fn):
+        calls, nanoseconds = self.calls, self.nanoseconds
+        clock = time.perf_counter_ns
+
+        def timed(*args):
+            start = clock()
+            try:
+                return fn(*args)
+            finally:
+                nanoseconds[label] += clock() - start
+                calls[label] += 1
+        return timed
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.originals = [(owner, attribute, getattr(owner, attribute)) for _, owner, attribute in PHASES]
+        for (label, _, _), (owner, attribute, fn) in zip(PHASES, self.originals):
+            setattr(owner, attribute, self._timed(label, fn))
+
+    def disable(self):
+        if not self.enabled:
+            return
+        for owner, attribute, fn in self.originals:
+            setattr(owner, attribute, fn)
+        self.originals = None
+
+    def reset(self):
+        for label in self.calls:
+            self.calls[label] = 0
+            self.nanoseconds[label] = 0
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.disable()
+
+    def merge(self, snapshot):
+        # Adds in the counts of another profiler's snapshot, e.g. from a worker
+        for label, phase in snapshot.items():
+            self.calls[label] += phase["calls"]
+            self.nanoseconds[label] += phase["ns"]
+
+    def snapshot(self):
+        # {phase: {"calls", "ns", "ns_per_call", "share"}} in pipeline order
+        total = sum(self.nanoseconds.values())
+        result = {}
+        for label, _, _ in PHASES:
+            calls, ns = self.calls[label], self.nanoseconds[label]
+            result[label] = {
+                "calls": calls,
+                "ns": ns,
+                "ns_per_call": ns / calls if calls else None,
+                "share": ns / total if total else 0.0,
+            }
+        return result
+
+    def to_json(self, path=None):
+        text = json.dumps(self.snapshot(), indent=2)
+        if path:
+            with open(path, "w") as f:
+                f.write(text + "\n")
+        return text
@@ -0,0 +1,198 @@
+"""Deterministic recordings of headless games.
+
+A recording is a seed plus the stream of actions taken, with a digest of the
+state after every turn as a checkpoint. Replaying feeds the same actions to
+the same rules (``apply_action``) from a fresh game seeded the same way, so it
+reproduces the game exactly at full engine speed. A replay can stop at any
+turn, and every checkpoint it passes is compared with the recorded one, so a
+rule change that alters a game is caught at the first turn it diverges.
+
+Recordings are JSON objects, one per line in a corpus file:
+
+    python replay.py record corpus.jsonl --games 5000 --seed 1
+    python replay.py verify corpus.jsonl --workers 8
+    python replay.py show corpus.jsonl --game 12 --turn 30
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from main import RULES, new_game, apply_action, game_outcome, game_state_lines
+from simulate import MAX_TURNS, MAX_ACTIONS_PER_TURN, greedy_policy, game_seed, game_rng
+
+CHUNK_SIZE = 100
+
+
+class ReplayMismatch(Exception):
+    def __init__(self, turn, expected, actual):
+        super().__init__(f"state after turn {turn} differs from the recording ({actual} != {expected})")
+        self.turn = turn
+        self.expected = expected
+        self.actual = actual
+
+
+def state_digest(state):
+    # Short, stable fingerprint of everything in a snapshot
+    return hashlib.blake2b(repr(state.snapshot()).encode(), digest_size=8).hexdigest()
+
+
+class Recorder:
+    # Plays a seeded game and records it. Apply actions through
+    # recorder.apply instead of apply_action.
+    def __init__(self, seed):
+        self.seed = seed
+        self.state, self.messages = new_game(game_rng(seed))
+        self.actions = []
+        self.checkpoints = []
+
+    def apply(self, action):
+        messages = apply_action(self.state, action)
+        self.actions.append(list(action))
+        if action[0] == "end_turn":
+            self.checkpoints.append(state_digest(self.state))
+        return messages
+
+    def recording(self):
+        return {
+            "seed": self.seed,
+            "rules": RULES.fingerprint(),
+            "actions": self.actions,
+            "checkpoints": self.checkpoints,
+            "outcome": game_outcome(self.state) or "timeout",
+            "turns": self.state.turn,
+        }
+
+def record_game(seed, policy=greedy_policy, max_turns=MAX_TURNS):
+    # The same turn loop as simulate.run_game, recorded
+    recorder = Recorder(seed)
+    state = recorder.state
+    for _ in range(max_turns):
+        if game_outcome(state):
+            break
+        for _ in range(MAX_ACTIONS_PER_TURN):
+            action = policy(state)
+            if action[0] == "end_turn":
+                break
+            recorder.apply(action)
+        recorder.apply(("end_turn",))
+    return recorder.recording()
+
+
+def replay(recording, until_turn=None, verify=True):
+    # Replays a recording and returns the final state, or the state at the
+    # start of `until_turn`. Raises ReplayMismatch at the first checkpoint
+    # that doesn't match.
+    state, _ = new_game(game_rng(recording["seed"]))
+    checkpoints = recording["checkpoints"]
+    turns_ended = 0
+    for name, *args in recording["actions"]:
+        if until_turn is not None and state.turn >= until_turn:
+            break
+        apply_action(state, (name, *args))
+        if name == "end_turn":
+            if verify and turns_ended < len(checkpoints):
+                digest = state_digest(state)
+                if digest != checkpoints[turns_ended]:
+                    raise ReplayMismatch(state.turn - 1, checkpoints[turns_ended], digest)
+            turns_ended += 1
+    return state
+
+def check_recording(recording):
+    # None if the recording replays exactly, otherwise what went wrong
+    try:
+        state = replay(recording)
+    except ReplayMismatch as e:
+        return {"turn": e.turn, "error": str(e)}
+    outcome = game_outcome(state) or "timeout"
+    if outcome != recording["outcome"] or state.turn != recording["turns"]:
+        return {"turn": state.turn, "error": f"ended in {outcome} on turn {state.turn}, "
+                                             f"recorded {recording['outcome']} on turn {recording['turns']}"}
+    return None
+
+
+# --- Corpora ---
+
+def read_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def write_corpus(path, recordings):
+    with open(path, "w", encoding="utf-8") as f:
+        for recording in recordings:
+            f.write(json.dumps(recording, separators=(",", ":")) + "\n")
+
+def record_chunk(seed, start, stop, policy=greedy_policy, max_turns=MAX_TURNS):
+    return [record_game(game_seed(seed, index), policy, max_turns) for index in range(start, stop)]
+
+def check_chunk(recordings, start):
+    failures = []
+    for index, recording in enumerate(recordings, start):
+        failure = check_recording(recording)
+        if failure is not None:
+            failures.append(dict(failure, game=index, seed=recording["seed"]))
+    return failures
+
+def _chunks(count, chunk_size):
+    return [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+
+def record_corpus(games, seed=0, policy=greedy_policy, max_turns=MAX_TURNS, workers=None, chunk_size=CHUNK_SIZE):
+    chunks = _chunks(games, chunk_size)
+    if workers == 1:
+        return [r for start, stop in chunks for r in record_chunk(seed, start, stop, policy, max_turns)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(record_chunk, seed, start, stop, policy, max_turns) for start, stop in chunks]
+        return [r for future in futures for r in future.result()]
+
+def verify_corpus(recordings, workers=None, chunk_size=CHUNK_SIZE):
+    # Replays every recording; returns a report listing the ones that diverge
+    chunks = _chunks(len(recordings), chunk_size)
+    if workers == 1:
+        failures = [f for start, stop in chunks for f in check_chunk(recordings[start:stop], start)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(check_chunk, recordings[start:stop], start) for start, stop in chunks]
+            failures = [f for future in futures for f in future.result()]
+    stale_rules = sum(1 for r in recordings if r.get("rules") != RULES.fingerprint())
+    return {
+        "recordings": len(recordings),
+        "matched": len(recordings) - len(failures),
+        "diverged": len(failures),
+        "recorded_under_other_rules": stale_rules,
+        "failures": failures,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and replay headless Poultry Geist games.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="record greedy-policy games into a corpus")
+    record.add_argument("corpus")
+    record.add_argument("--games", type=int, default=1000)
+    record.add_argument("--seed", type=int, default=0)
+    record.add_argument("--workers", type=int, default=os.cpu_count())
+    record.add_argument("--max-turns", type=int, default=MAX_TURNS)
+
+    verify = commands.add_parser("verify", help="replay a corpus and report games that diverge")
+    verify.add_argument("corpus")
+    verify.add_argument("--workers", type=int, default=os.cpu_count())
+
+    show = commands.add_parser("show", help="print one recorded game at a given turn")
+    show.add_argument("corpus")
+    show.add_argument("--game", type=int, default=0)
+    show.add_argument("--turn", type=int, help="stop at the start of this turn (default: the end)")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        write_corpus(args.corpus, record_corpus(args.games, args.seed, max_turns=args.max_turns, workers=args.workers))
+    elif args.command == "verify":
+        print(json.dumps(verify_corpus(read_corpus(args.corpus), workers=args.workers), indent=2))
+    else:
+        state = replay(read_corpus(args.corpus)[args.game], until_turn=args.turn)
+        print("\n".join(game_state_lines(state, [])))
+
+if __name__ == "__main__":
+    main()
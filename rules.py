@@ -0,0 +1,166 @@
+"""Game rules loaded from rules.json and compiled for the turn pipeline.
+
+rules.json is the single source of balance values for the console game, the
+GUI, the simulators and index.html. ``Ruleset`` keeps the raw tables (the
+dicts main.py has always exposed) and compiles them once into flat tables
+indexed by integers: a season index with one multiplier vector per seasonal
+effect, and per-breed stat arrays. A season with no entry for an effect gets
+the neutral value, so alternate configs only list what they change.
+
+Each event names the effect handler it triggers (see main.EVENT_EFFECTS) and
+may set a "weight" (default 1) and per-season "season_weights". Events are
+drawn from a per-season alias table, so a draw is one uniform and two lookups
+however many events there are.
+
+Set POULTRYGEIST_RULES to the path of another rules file to play with it.
+"""
+
+import json
+import os
+import sys
+
+RULES_ENV_VAR = "POULTRYGEIST_RULES"
+# PyInstaller unpacks bundled data files next to the frozen modules
+DEFAULT_RULES_PATH = os.path.join(getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__))), "rules.json")
+
+
+class Ruleset:
+    def __init__(self, data):
+        self.data = data
+
+        # Raw tables, in the shapes main.py has always used
+        self.initial_cash = data["initial_cash"]
+        self.initial_feed = data["initial_feed"]
+        self.initial_chickens = data["initial_chickens"]
+        self.turns_per_season = data["turns_per_season"]
+        self.event_chance = data["event_chance"]
+        self.hatching_cost = data["hatching_cost"]
+        self.hatching_success_rate = data["hatching_success_rate"]
+        # JSON object keys are strings; coop levels are integers
+        self.coop_upgrades = {int(level): upgrade for level, upgrade in data["coop_upgrades"].items()}
+        self.victory_eggs = data["victory"]["eggs"]
+        self.victory_cash = data["victory"]["cash"]
+        self.victory_meat = data["victory"]["meat"]
+        self.ghost_exchange_rates = data["ghost_exchange_rates"]
+        self.chicken_stats = data["chicken_stats"]
+        self.seasons = data["seasons"]
+        self.events = data["events"]
+
+        # Seasons: GameState keeps an integer index into these
+        self.season_names = tuple(self.seasons)
+        self.season_index = {name: i for i, name in enumerate(self.season_names)}
+        self.season_messages = self._season_vector("message", "")
+        self.season_egg_delta = tuple(s.get("egg_increase", 0.0) - s.get("egg_reduction", 0.0)
+                                      for s in self.seasons.values())
+        self.season_feed_multiplier = tuple(1.0 + v for v in self._season_vector("feed_increase", 0.0))
+        self.season_feed_price = tuple(1.0 + v for v in self._season_vector("feed_cost_increase", 0.0))
+        self.season_hatch_rate = tuple(self.hatching_success_rate + v for v in self._season_vector("hatching_bonus", 0.0))
+        self.season_chicken_price_factor = tuple(1 - v for v in self._season_vector("new_chicken_discount", 0.0))
+        self.season_meat_bonus = self._season_vector("meat_bonus", 0.0)
+        self.season_market_bonus = self._season_vector("market_increase", 0.0)
+        self.season_illness_chance = self._season_vector("illness_chance", 0.0)
+
+        # Breeds: parallel arrays indexed by breed_index
+        self.breeds = tuple(self.chicken_stats)
+        self.breed_index = {breed: i for i, breed in enumerate(self.breeds)}
+        self.breed_tier = self._breed_vector("tier")
+        self.breed_eggs = self._breed_vector("eggs")
+        self.breed_meat = self._breed_vector("meat")
+        self.breed_feed = self._breed_vector("feed")
+        self.breed_health = self._breed_vector("health")
+        self.breed_cash = self._breed_vector("cash")
+        # (eggs, meat, feed, health, cash) per breed name, for building a Chicken
+        self.breed_stats = {breed: (s["eggs"], s["meat"], s["feed"], s["health"], s["cash"])
+                            for breed, s in self.chicken_stats.items()}
+        self.min_chicken_price = min(self.breed_cash)
+
+        self.tiers = tuple(self.ghost_exchange_rates)
+        self._compile_events()
+        self.coop_capacity = {level: upgrade["capacity"] for level, upgrade in self.coop_upgrades.items()}
+
+    def _season_vector(self, key, default):
+        return tuple(season.get(key, default) for season in self.seasons.values())
+
+    def _breed_vector(self, key):
+        return tuple(stats[key] for stats in self.chicken_stats.values())
+
+    def _compile_events(self):
+        self.event_items = tuple(self.events.items())
+        # (name, message, effect) per event, in event_items order
+        self.event_entries = tuple((name, e["message"], e["effect"]) for name, e in self.event_items)
+        self.season_event_weights = tuple(
+            tuple(e.get("season_weights", {}).get(season, e.get("weight", 1.0)) for _, e in self.event_items)
+            for season in self.season_names)
+        self.season_event_tables = tuple(alias_table(w) for w in self.season_event_weights)
+
+    def add_event(self, name, effect, message, weight=1.0, season_weights=None):
+        # Adds (or replaces) an event without editing rules.json; `effect`
+        # must name a handler registered in main.EVENT_EFFECTS
+        event = {"effect": effect, "message": message, "weight": weight}
+        if season_weights:
+            event["season_weights"] = dict(season_weights)
+        self.events[name] = event
+        self._compile_events()
+
+    def draw_event(self, season_index, u):
+        # Index into event_entries picked by the uniform `u`, or None when no
+        # event can happen this season
+        table = self.season_event_tables[season_index]
+        if table is None:
+            return None
+        probability, alias = table
+        x = u * len(probability)
+        column = int(x)
+        return column if x - column < probability[column] else alias[column]
+
+    def event_roll(self, season_index, event):
+        # A uniform that makes draw_event pick `event`, for scripted rngs;
+        # None if the event can't happen this season
+        table = self.season_event_tables[season_index]
+        if table is None:
+            return None
+        probability, alias = table
+        n = len(probability)
+        if probability[event] > 0:
+            return (event + probability[event] / 2) / n
+        for column, (p, a) in enumerate(zip(probability, alias)):
+            if a == event and p < 1:
+                return (column + (1 + p) / 2) / n
+        return None
+
+    def fingerprint(self):
+        # Stable hash of the rule values, e.g. to key cached results by ruleset
+        import hashlib  # only the tools need it; keep it off the game's startup path
+        text = json.dumps(self.data, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def alias_table(weights):
+    # Vose's alias method: (probability, alias) columns such that picking a
+    # column uniformly, then keeping it with its probability or else taking
+    # its alias, draws index i with chance weights[i] / sum(weights)
+    total = sum(weights)
+    if total <= 0:
+        return None
+    n = len(weights)
+    scaled = [w * n / total for w in weights]
+    probability = [1.0] * n
+    alias = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1]
+    large = [i for i, p in enumerate(scaled) if p >= 1]
+    while small and large:
+        low, high = small.pop(), large.pop()
+        probability[low] = scaled[low]
+        alias[low] = high
+        scaled[high] += scaled[low] - 1
+        (small if scaled[high] < 1 else large).append(high)
+    # Whatever is left is 1 up to rounding error
+    return tuple(probability), tuple(alias)
+
+
+def load_ruleset(path=None):
+    # An explicit path wins, then POULTRYGEIST_RULES, then the bundled rules.json
+    if path is None:
+        path = os.environ.get(RULES_ENV_VAR) or DEFAULT_RULES_PATH
+    with open(path, encoding="utf-8") as f:
+        return Ruleset(json.load(f))
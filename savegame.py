@@ -0,0 +1,421 @@
+"""Saved games: a binary snapshot plus an append-only journal.
+
+A save is two files. ``<name>.sav`` holds a full snapshot of the GameState in
+a compact binary format (runs of identical chickens and ghosts, the spirit
+ledger as per-tier counts, the rng state), so writing it is O(state size).
+``<name>.jnl`` holds every action applied since that snapshot, with the random
+draws it made, written in buffered batches once per turn.
+
+``Session`` wraps a farm and keeps both up to date. After a crash or a killed
+process, ``Session.resume`` loads the snapshot and replays the journal tail,
+feeding each action the draws it made the first time. Every few turns the
+session writes a fresh snapshot and starts an empty journal.
+"""
+
+import os
+import struct
+import zlib
+
+from main import ACTIONS, GameState, apply_action
+
+SAVE_DIR = os.environ.get("POULTRYGEIST_SAVE_DIR") or os.path.join(os.path.expanduser("~"), ".poultrygeist")
+SNAPSHOT_EVERY = 25  # turns between full snapshots
+
+SAVE_MAGIC = b"PGSAVE"
+JOURNAL_MAGIC = b"PGJRNL"
+FORMAT_VERSION = 1
+
+FILE_HEADER = struct.Struct("<6sHQ")  # magic, format version, generation
+STATE = struct.Struct("<dBqqqqqqBq?dBqq")
+CHICKEN_RUN = struct.Struct("<IBBqq")  # count, breed, tier, purchase price, current health
+GHOST_RUN = struct.Struct("<IB")       # count, tier
+COUNT = struct.Struct("<I")
+INT = struct.Struct("<q")
+FLOAT = struct.Struct("<d")
+
+
+class SaveError(Exception):
+    pass
+
+
+# --- Encoding helpers ---
+
+def _pack_str(text):
+    data = text.encode("utf-8")
+    return COUNT.pack(len(data)) + data
+
+def _pack_names(names):
+    return COUNT.pack(len(names)) + b"".join(_pack_str(name) for name in names)
+
+def _runs(values):
+    # Run-length encode a sequence: [(count, value), ...]
+    runs = []
+    for value in values:
+        if runs and runs[-1][1] == value:
+            runs[-1][0] += 1
+        else:
+            runs.append([1, value])
+    return runs
+
+
+class _Reader:
+    __slots__ = ("data", "offset")
+
+    def __init__(self, data, offset=0):
+        self.data = data
+        self.offset = offset
+
+    def unpack(self, layout):
+        try:
+            values = layout.unpack_from(self.data, self.offset)
+        except struct.error as e:
+            raise SaveError(f"truncated data: {e}") from None
+        self.offset += layout.size
+        return values
+
+    def count(self):
+        return self.unpack(COUNT)[0]
+
+    def string(self):
+        size = self.count()
+        data = self.data[self.offset:self.offset + size]
+        if len(data) != size:
+            raise SaveError("truncated string")
+        self.offset += size
+        return data.decode("utf-8")
+
+    def names(self):
+        return [self.string() for _ in range(self.count())]
+
+
+# --- Snapshots ---
+
+def encode_state(state):
+    (cash, banked_cash, feed, eggs, meat, turn, year, season_index, meat_harvested_this_year,
+     double_eggs_active, egg_price_multiplier, coop_level, eggs_this_turn, health_bonus,
+     chickens, ghosts, graveyard) = state.snapshot()
+
+    tiers = [tier for tier, _ in graveyard]
+    breeds = []
+    for breed, tier, _, _ in chickens:
+        if breed not in breeds:
+            breeds.append(breed)
+        if tier not in tiers:
+            tiers.append(tier)
+    for tier in ghosts:
+        if tier not in tiers:
+            tiers.append(tier)
+
+    parts = [
+        STATE.pack(cash, isinstance(cash, int), banked_cash, feed, eggs, meat, turn, year,
+                   season_index, meat_harvested_this_year, double_eggs_active,
+                   egg_price_multiplier, coop_level, eggs_this_turn, health_bonus),
+        _pack_names(breeds),
+        _pack_names(tiers),
+    ]
+    chicken_runs = _runs(chickens)
+    parts.append(COUNT.pack(len(chicken_runs)))
+    parts.extend(CHICKEN_RUN.pack(count, breeds.index(breed), tiers.index(tier), price, health)
+                 for count, (breed, tier, price, health) in chicken_runs)
+    ghost_runs = _runs(ghosts)
+    parts.append(COUNT.pack(len(ghost_runs)))
+    parts.extend(GHOST_RUN.pack(count, tiers.index(tier)) for count, tier in ghost_runs)
+    parts.append(COUNT.pack(len(graveyard)))
+    parts.extend(INT.pack(count) for _, count in graveyard)
+    parts.append(_encode_rng_state(state.rng))
+    return b"".join(parts)
+
+def decode_state(data, rng=None):
+    reader = _Reader(data)
+    (cash, cash_is_int, banked_cash, feed, eggs, meat, turn, year, season_index,
+     meat_harvested_this_year, double_eggs_active, egg_price_multiplier, coop_level,
+     eggs_this_turn, health_bonus) = reader.unpack(STATE)
+    if cash_is_int:
+        cash = int(cash)
+    breeds = reader.names()
+    tiers = reader.names()
+    chickens = []
+    for _ in range(reader.count()):
+        count, breed, tier, price, health = reader.unpack(CHICKEN_RUN)
+        chickens.extend([(breeds[breed], tiers[tier], price, health)] * count)
+    ghosts = []
+    for _ in range(reader.count()):
+        count, tier = reader.unpack(GHOST_RUN)
+        ghosts.extend([tiers[tier]] * count)
+    graveyard = tuple((tiers[i], reader.unpack(INT)[0]) for i in range(reader.count()))
+    rng_state = _decode_rng_state(reader)
+
+    state = GameState.from_snapshot((
+        cash, banked_cash, feed, eggs, meat, turn, year, season_index, meat_harvested_this_year,
+        double_eggs_active, egg_price_multiplier, coop_level, eggs_this_turn, health_bonus,
+        tuple(chickens), tuple(ghosts), graveyard,
+    ), rng)
+    if rng_state is not None and hasattr(state.rng, "setstate"):
+        state.rng.setstate(rng_state)
+    return state
+
+def _encode_rng_state(rng):
+    # random.Random state: (version, tuple of ints, gauss_next). Other rngs are
+    # not saved; a resumed game then just continues with a fresh stream.
+    getstate = getattr(rng, "getstate", None)
+    if getstate is None:
+        return COUNT.pack(0)
+    version, internal, gauss_next = getstate()
+    return b"".join([
+        COUNT.pack(1), COUNT.pack(version), COUNT.pack(len(internal)),
+        struct.pack(f"<{len(internal)}I", *internal),
+        COUNT.pack(gauss_next is not None), FLOAT.pack(gauss_next or 0.0),
+    ])
+
+def _decode_rng_state(reader):
+    if not reader.count():
+        return None
+    version = reader.count()
+    internal = reader.unpack(struct.Struct(f"<{reader.count()}I"))
+    has_gauss = reader.count()
+    gauss_next = reader.unpack(FLOAT)[0]
+    return version, internal, gauss_next if has_gauss else None
+
+def write_save(path, state, generation):
+    body = encode_state(state)
+    data = FILE_HEADER.pack(SAVE_MAGIC, FORMAT_VERSION, generation) + body + COUNT.pack(zlib.crc32(body))
+    # Write beside the old save and swap, so a crash never leaves half a file
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def read_save(path, rng=None):
+    # Returns (state, generation)
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, generation = _Reader(data).unpack(FILE_HEADER)
+    if magic != SAVE_MAGIC or version != FORMAT_VERSION:
+        raise SaveError(f"{path} is not a Poultry Geist save (version {FORMAT_VERSION})")
+    body, checksum = data[FILE_HEADER.size:-COUNT.size], data[-COUNT.size:]
+    if COUNT.unpack(checksum)[0] != zlib.crc32(body):
+        raise SaveError(f"{path} is corrupted")
+    return decode_state(body, rng), generation
+
+
+# --- Journal ---
+
+def _encode_value(value):
+    if isinstance(value, bool) or value is None:
+        raise SaveError(f"cannot journal action argument {value!r}")
+    if isinstance(value, int):
+        return b"i" + INT.pack(value)
+    if isinstance(value, float):
+        return b"f" + FLOAT.pack(value)
+    return b"s" + _pack_str(value)
+
+def _decode_value(reader):
+    tag = reader.data[reader.offset:reader.offset + 1]
+    reader.offset += 1
+    if tag == b"i":
+        return reader.unpack(INT)[0]
+    if tag == b"f":
+        return reader.unpack(FLOAT)[0]
+    if tag == b"s":
+        return reader.string()
+    raise SaveError(f"bad journal value tag {tag!r}")
+
+def encode_action(action):
+    # The action half of a journal entry. Session.apply encodes it before the
+    # action runs, so an argument the journal can't hold is refused up front.
+    name, *args = action
+    parts = [_pack_str(name), COUNT.pack(len(args))]
+    parts.extend(_encode_value(arg) for arg in args)
+    return b"".join(parts)
+
+def encode_draws(draws):
+    # Every draw is a uniform from rng.random(). Each keeps its one-byte tag
+    # so journals written so far still read.
+    return COUNT.pack(len(draws)) + b"".join(b"f" + FLOAT.pack(draw) for draw in draws)
+
+def encode_entry(action, draws):
+    return encode_action(action) + encode_draws(draws)
+
+def decode_entry(payload):
+    reader = _Reader(payload)
+    name = reader.string()
+    args = [_decode_value(reader) for _ in range(reader.count())]
+    draws = []
+    for _ in range(reader.count()):
+        tag = payload[reader.offset:reader.offset + 1]
+        reader.offset += 1
+        if tag != b"f":
+            raise SaveError(f"bad journal draw tag {tag!r}")
+        draws.append(reader.unpack(FLOAT)[0])
+    return (name, *args), draws
+
+class Journal:
+    # Append-only log of (action, draws) records, each length-prefixed and
+    # checksummed. Records are buffered and handed to the OS by flush(), which
+    # is enough to survive the game process crashing or being killed.
+    def __init__(self, path, generation):
+        self.path = path
+        self.buffer = []
+        self.file = open(path, "wb")
+        self.file.write(FILE_HEADER.pack(JOURNAL_MAGIC, FORMAT_VERSION, generation))
+        self.file.flush()
+
+    def record(self, action, draws):
+        self.append(encode_entry(action, draws))
+
+    def append(self, payload):
+        self.buffer.append(COUNT.pack(len(payload)) + payload + COUNT.pack(zlib.crc32(payload)))
+
+    def flush(self):
+        if self.buffer:
+            self.file.write(b"".join(self.buffer))
+            self.buffer.clear()
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+def read_journal(path):
+    # Returns (generation, entries). A torn or corrupt tail, e.g. from a crash
+    # mid-write, ends the journal there.
+    with open(path, "rb") as f:
+        data = f.read()
+    reader = _Reader(data)
+    magic, version, generation = reader.unpack(FILE_HEADER)
+    if magic != JOURNAL_MAGIC or version != FORMAT_VERSION:
+        raise SaveError(f"{path} is not a Poultry Geist journal")
+    entries = []
+    while reader.offset + COUNT.size <= len(data):
+        size = reader.count()
+        payload = data[reader.offset:reader.offset + size]
+        reader.offset += size
+        if len(payload) != size or reader.offset + COUNT.size > len(data):
+            break
+        if reader.count() != zlib.crc32(payload):
+            break
+        entries.append(decode_entry(payload))
+    return generation, entries
+
+
+# --- Random draws ---
+
+class RecordingRNG:
+    # Wraps a farm's rng and remembers every draw
+    __slots__ = ("rng", "draws")
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.draws = []
+
+    def random(self):
+        value = self.rng.random()
+        self.draws.append(value)
+        return value
+
+class ReplayRNG:
+    # Hands back recorded draws in order
+    __slots__ = ("draws",)
+
+    def __init__(self, draws):
+        self.draws = list(reversed(draws))
+
+    def random(self):
+        return self.draws.pop()
+
+def advance_rng(rng, draws):
+    # Move a live rng past draws that were replayed from the journal, so the
+    # game continues exactly as if it had never stopped
+    for _ in draws:
+        rng.random()
+
+
+# --- Sessions ---
+
+def save_paths(name, directory=None):
+    base = os.path.join(directory or SAVE_DIR, name)
+    return base + ".sav", base + ".jnl"
+
+def has_save(name, directory=None):
+    return os.path.exists(save_paths(name, directory)[0])
+
+class Session:
+    # A farm whose every action is journaled. Apply actions through
+    # session.apply instead of apply_action.
+    def __init__(self, name, state, directory=None, generation=0):
+        self.save_path, self.journal_path = save_paths(name, directory)
+        os.makedirs(os.path.dirname(self.save_path), exist_ok=True)
+        self.state = state
+        self.live_rng = state.rng
+        self.recorder = RecordingRNG(self.live_rng)
+        self.generation = generation
+        self.journal = None
+        self.turns_since_snapshot = 0
+        self.checkpoint()
+
+    @classmethod
+    def resume(cls, name, directory=None, rng=None):
+        # Load the last snapshot and replay the journal behind it. Returns the
+        # session and the messages of the last replayed turn.
+        save_path, journal_path = save_paths(name, directory)
+        state, generation = read_save(save_path, rng)
+        live_rng = state.rng
+        messages = []
+        entries = []
+        if os.path.exists(journal_path):
+            try:
+                journal_generation, entries = read_journal(journal_path)
+            except SaveError:
+                entries = []
+            else:
+                if journal_generation != generation:
+                    entries = []  # written before the snapshot; already included
+        for action, draws in entries:
+            state.rng = ReplayRNG(draws)
+            result = apply_action(state, action)
+            messages = result if action[0] == "end_turn" else messages + result
+            advance_rng(live_rng, draws)
+        state.rng = live_rng
+        return cls(name, state, directory, generation), messages
+
+    def apply(self, action):
+        if action[0] not in ACTIONS:
+            return apply_action(self.state, action)
+        entry = encode_action(action)  # raises SaveError before the farm changes
+        self.recorder.draws = []
+        self.state.rng = self.recorder
+        try:
+            messages = apply_action(self.state, action)
+        finally:
+            self.state.rng = self.live_rng
+        self.journal.append(entry + encode_draws(self.recorder.draws))
+        if action[0] == "end_turn":
+            self.turns_since_snapshot += 1
+            if self.turns_since_snapshot >= SNAPSHOT_EVERY:
+                self.checkpoint()
+            else:
+                self.journal.flush()
+        return messages
+
+    def checkpoint(self):
+        # Full snapshot and an empty journal. Also needed after the state is
+        # changed outside apply(), e.g. by undo.
+        if self.journal is not None:
+            self.journal.close()
+        self.generation += 1
+        write_save(self.save_path, self.state, self.generation)
+        self.journal = Journal(self.journal_path, self.generation)
+        self.turns_since_snapshot = 0
+
+    def close(self):
+        self.checkpoint()
+        self.journal.close()
+
+    def discard(self):
+        # The game is over; remove its files
+        self.journal.file.close()
+        for path in (self.save_path, self.journal_path):
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,107 @@
+"""Incremental ANSI renderer for the console front-end.
+
+``Screen`` keeps a model of the frame currently on the terminal, one string per
+row from the top. ``render(lines)`` compares the new frame with the model and
+rewrites only the rows that changed, using cursor-positioning escapes instead
+of clearing the terminal, so redraws don't flicker and no subprocess is
+spawned. Anything printed below the frame (menus, prompts) is erased on the
+next render.
+
+When stdout is not a terminal the frame is simply printed, as before.
+"""
+
+import os
+import sys
+
+CSI = "\x1b["
+
+
+def enable_ansi(stream):
+    # True if `stream` is a terminal that understands ANSI escapes
+    if not stream.isatty():
+        return False
+    if os.name != "nt":
+        return True
+    # Windows 10+ consoles need virtual terminal processing switched on
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))  # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+    except (AttributeError, OSError):
+        return False
+
+
+class Screen:
+    # Rows kept free below the frame for menus and prompts. Printing more than
+    # this scrolls the terminal, so callers announce long listings with
+    # note_lines and the next render repaints everything.
+    RESERVED_ROWS = 14
+
+    def __init__(self, stream=None):
+        self.stream = stream if stream is not None else sys.stdout
+        self.ansi = None  # decided on first output, so importing has no side effects
+        self.lines = None  # rows on the terminal; None when unknown
+        self.size = None
+        self.rows_written = 0  # rows repainted so far, for benchmarks
+
+    def terminal_size(self):
+        import shutil  # pulls in the compression modules; not needed before the first frame
+        return shutil.get_terminal_size()
+
+    def frame_height(self):
+        # Rows a frame may use without pushing menus off the bottom; None when
+        # the output is not a terminal and any length will do
+        if not self.uses_ansi():
+            return None
+        return max(1, self.terminal_size().lines - self.RESERVED_ROWS)
+
+    def invalidate(self):
+        self.lines = None
+
+    def note_lines(self, count):
+        if count > self.RESERVED_ROWS:
+            self.invalidate()
+
+    def uses_ansi(self):
+        if self.ansi is None:
+            self.ansi = enable_ansi(self.stream)
+        return self.ansi
+
+    def clear(self):
+        if self.uses_ansi():
+            self.stream.write(f"{CSI}H{CSI}2J")
+            self.stream.flush()
+        self.lines = []
+
+    def render(self, lines):
+        if not self.uses_ansi():
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+            return
+
+        size = self.terminal_size()
+        if size != self.size:
+            self.size = size
+            self.invalidate()
+        # A line wider than the terminal would wrap onto the next row
+        width = max(1, size.columns - 1)
+        lines = [line[:width] for line in lines]
+
+        out = []
+        previous = self.lines
+        if previous is None:
+            out.append(f"{CSI}H{CSI}2J")
+            previous = []
+        for row, line in enumerate(lines):
+            if row >= len(previous) or previous[row] != line:
+                out.append(f"{CSI}{row + 1};1H{line}{CSI}K")
+                self.rows_written += 1
+        # Drop leftover rows of a longer frame and whatever was printed below
+        out.append(f"{CSI}{len(lines) + 1};1H{CSI}J")
+        self.stream.write("".join(out))
+        self.stream.flush()
+        self.lines = lines
@@ -0,0 +1,256 @@
+"""Host many Poultry Geist farms in one process over a line-based TCP protocol.
+
+Every request and response is one line of JSON. A client starts a farm, then
+sends actions for it by session id; the actions are the engine's action tuples
+(``apply_action``), the same ones the console menu applies:
+
+    {"op": "new"}                                         -> {"ok": true, "session": "3f0c...", "messages": [...], "state": {...}}
+    {"op": "act", "session": "3f0c...", "action": ["buy_chicken", "Duck"]}
+    {"op": "act", "session": "3f0c...", "action": ["end_turn"]}
+    {"op": "state", "session": "3f0c..."}
+    {"op": "end", "session": "3f0c..."}
+    {"op": "stats"}
+
+A response to "act" carries "outcome" ("win" or "bankrupt") once the game is
+over, and the farm is then closed. Errors come back as {"ok": false, "error": ...}.
+
+Farms live in a ``SessionStore``: past the memory budget, idle farms are
+written to disk and read back on their next request.
+
+The server is a single asyncio event loop. Actions are fast, synchronous calls
+into the engine, so thousands of farms and connections share one core without
+a process or thread per game:
+
+    python server.py --port 7777 --memory-budget 512
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import secrets
+import sys
+import time
+import traceback
+
+from main import new_game, apply_action, game_outcome
+from sessionstore import DEFAULT_BUDGET, SessionStore
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7777
+# Longest request line accepted, in bytes
+MAX_LINE = 64 * 1024
+# Argument types of each action, in order. JSON numbers arrive as int or
+# float, so counts and indexes must be checked before they reach the engine,
+# where a float would end up in the farm's stock and break saving it.
+ACTION_ARGS = {
+    "buy_chicken": (str,),
+    "sell_chicken": (int,),
+    "harvest_chicken": (int,),
+    "buy_feed": (int,),
+    "sell_eggs": (int,),
+    "hatch_eggs": (),
+    "bank_cash": (int,),
+    "upgrade_coop": (),
+    "exchange_ghost": (str,),
+    "exchange_all_ghosts": (),
+    "use_ghost_ability": (int, int),
+    "end_turn": (),
+}
+# Trailing arguments that may be left out: a Silver ghost needs no chicken index
+OPTIONAL_ARGS = {"use_ghost_ability": 1}
+
+
+class RequestError(Exception):
+    pass
+
+
+def state_view(state):
+    # JSON-friendly picture of a farm. Chickens are listed in the order that
+    # sell_chicken and harvest_chicken index them.
+    return {
+        "turn": state.turn,
+        "year": state.year,
+        "season": state.season,
+        "cash": state.cash,
+        "banked_cash": state.banked_cash,
+        "feed": state.feed,
+        "eggs": state.eggs,
+        "meat": state.meat,
+        "meat_this_year": state.meat_harvested_this_year,
+        "eggs_this_turn": state.eggs_this_turn,
+        "coop_level": state.coop_level,
+        "coop_capacity": state.get_coop_capacity(),
+        "chickens": [[c.breed, c.tier, c.current_health] for c in state.chickens],
+        "ghosts": dict(state.ghost_counts),
+        "graveyard": dict(state.graveyard),
+    }
+
+def is_type(value, kind):
+    # bool is an int subclass, but True is not a chicken index
+    return isinstance(value, kind) and not isinstance(value, bool)
+
+def check_action(action):
+    if not isinstance(action, list) or not action or action[0] not in ACTION_ARGS:
+        raise RequestError(f"unknown action: {action!r}; expected one of {sorted(ACTION_ARGS)}")
+    name, *args = action
+    types = ACTION_ARGS[name]
+    fewest = len(types) - OPTIONAL_ARGS.get(name, 0)
+    if not fewest <= len(args) <= len(types):
+        expected = f"{fewest} to {len(types)}" if fewest < len(types) else str(len(types))
+        raise RequestError(f"{name} takes {expected} arguments, got {len(args)}")
+    for position, (value, kind) in enumerate(zip(args, types), 1):
+        if not is_type(value, kind):
+            raise RequestError(f"argument {position} of {name} must be {kind.__name__}, got {value!r}")
+    return tuple(action)
+
+
+class GameServer:
+    def __init__(self, sessions=None):
+        self.sessions = sessions if sessions is not None else SessionStore()
+        self.requests = 0
+        self.games_started = 0
+        self.games_finished = 0
+        self.request_seconds = 0.0
+
+    def session(self, request):
+        session_id = request.get("session")
+        if not isinstance(session_id, str):
+            raise RequestError(f"session must be a string, got {session_id!r}")
+        state = self.sessions.get(session_id)
+        if state is None:
+            raise RequestError(f"no such session: {session_id}")
+        return session_id, state
+
+    def op_new(self, request):
+        seed = request.get("seed")
+        if seed is not None and not (is_type(seed, int) or isinstance(seed, str)):
+            raise RequestError(f"seed must be an integer or a string, got {seed!r}")
+        state, messages = new_game(random.Random(seed))
+        session_id = secrets.token_hex(8)
+        self.sessions.put(session_id, state)
+        self.games_started += 1
+        return {"session": session_id, "messages": messages, "state": state_view(state)}
+
+    def op_act(self, request):
+        session_id, state = self.session(request)
+        action = check_action(request.get("action"))
+        try:
+            messages = apply_action(state, action)
+        except (TypeError, ValueError, IndexError, KeyError) as e:
+            raise RequestError(f"bad arguments for {action[0]}: {e}") from e
+        response = {"messages": messages, "state": state_view(state)}
+        outcome = game_outcome(state)
+        if outcome:
+            response["outcome"] = outcome
+            self.sessions.pop(session_id)
+            self.games_finished += 1
+        else:
+            self.sessions.put(session_id, state)  # the flock may have grown
+        return response
+
+    def op_state(self, request):
+        _, state = self.session(request)
+        return {"state": state_view(state)}
+
+    def op_end(self, request):
+        session_id, _ = self.session(request)
+        self.sessions.pop(session_id)
+        return {}
+
+    def op_stats(self, request):
+        return {
+            "sessions": len(self.sessions),
+            "games_started": self.games_started,
+            "games_finished": self.games_finished,
+            "requests": self.requests,
+            "mean_request_us": self.request_seconds / self.requests * 1e6 if self.requests else None,
+            "store": self.sessions.stats(),
+        }
+
+    OPS = {"new": op_new, "act": op_act, "state": op_state, "end": op_end, "stats": op_stats}
+
+    def respond(self, line):
+        # One request line in, one response dict out
+        start = time.perf_counter()
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise RequestError("a request is a JSON object")
+            op = self.OPS.get(request.get("op"))
+            if op is None:
+                raise RequestError(f"unknown op: {request.get('op')!r}; expected one of {sorted(self.OPS)}")
+            response = dict(op(self, request), ok=True)
+        except json.JSONDecodeError as e:
+            response = {"ok": False, "error": f"invalid JSON: {e}"}
+        except RequestError as e:
+            response = {"ok": False, "error": str(e)}
+        except Exception as e:
+            # A bug must cost one request, not the client's connection
+            traceback.print_exc(file=sys.stderr)
+            response = {"ok": False, "error": f"internal error: {type(e).__name__}: {e}"}
+        self.requests += 1
+        self.request_seconds += time.perf_counter() - start
+        return response
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        loop = asyncio.get_running_loop()
+        return await loop.create_server(lambda: LineProtocol(self), host, port)
+
+
+class LineProtocol(asyncio.Protocol):
+    # One client connection. Plain protocol callbacks rather than streams keep
+    # the per-request overhead to a buffer split and a write; pipelined
+    # requests are answered in order.
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+        self.buffer = b""
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        *lines, self.buffer = (self.buffer + data).split(b"\n")
+        if len(self.buffer) > MAX_LINE:
+            self.transport.write(b'{"ok": false, "error": "request too long"}\n')
+            self.transport.close()
+            return
+        responses = [json.dumps(self.server.respond(line)).encode() for line in lines if line.strip()]
+        if responses:
+            responses.append(b"")
+            self.transport.write(b"\n".join(responses))
+
+    # A client that stops reading its responses stops being read from
+    def pause_writing(self):
+        self.transport.pause_reading()
+
+    def resume_writing(self):
+        self.transport.resume_reading()
+
+
+async def serve_forever(host, port, store):
+    server = await GameServer(store).serve(host, port)
+    for sock in server.sockets:
+        print(f"Poultry Geist server listening on {sock.getsockname()}")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Host Poultry Geist farms over a JSON-lines TCP protocol.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--memory-budget", type=int, default=DEFAULT_BUDGET // 2 ** 20,
+                        help="MiB of farms to keep in memory before evicting idle ones to disk")
+    parser.add_argument("--spill-dir", help="where evicted farms go (default: a new temporary directory)")
+    args = parser.parse_args()
+    store = SessionStore(args.memory_budget * 2 ** 20, args.spill_dir)
+    try:
+        asyncio.run(serve_forever(args.host, args.port, store))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Memory-bounded store for the farms a server hosts.
+
+``SessionStore`` maps session ids to ``GameState`` objects and keeps the
+estimated memory of the farms it holds under a budget. When a farm is added
+or grows past the budget, the least recently used farms are written to disk
+in savegame's binary snapshot form (rng state included) and dropped from
+memory. The next ``get`` of an evicted farm reads it back, so callers never
+see the difference except in latency. A farm that cannot be written stays in
+memory, over budget if need be, rather than being lost. Counters report how often lookups hit
+memory, had to go to disk, and how many farms were evicted.
+"""
+
+import itertools
+import os
+import random
+import sys
+import tempfile
+from collections import OrderedDict
+
+from savegame import encode_state, decode_state
+
+# Rough heap cost of a farm, measured with tracemalloc on CPython 3.11: a new
+# farm (including its random.Random) and each extra chicken and ghost
+STATE_BYTES = 5000
+CHICKEN_BYTES = 290
+GHOST_BYTES = 50
+DEFAULT_BUDGET = 256 * 1024 * 1024
+
+
+def estimate_state_bytes(state):
+    return STATE_BYTES + CHICKEN_BYTES * len(state.chickens) + GHOST_BYTES * sum(state.ghost_counts.values())
+
+
+class SessionStore:
+    def __init__(self, budget=DEFAULT_BUDGET, directory=None):
+        self.budget = budget
+        self.owns_directory = directory is None
+        self.directory = directory or tempfile.mkdtemp(prefix="poultrygeist-sessions-")
+        os.makedirs(self.directory, exist_ok=True)
+        self.resident = OrderedDict()  # id -> (state, estimated bytes), oldest first
+        self.resident_bytes = 0
+        self.spilled = set()
+        self.unspillable = set()  # resident farms that failed to encode, until they next change
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.failed_evictions = 0
+
+    def path(self, session_id):
+        return os.path.join(self.directory, f"{session_id}.sav")
+
+    def __contains__(self, session_id):
+        return session_id in self.resident or session_id in self.spilled
+
+    def __len__(self):
+        return len(self.resident) + len(self.spilled)
+
+    def get(self, session_id):
+        # The farm, read back from disk if it was evicted; None if unknown
+        entry = self.resident.get(session_id)
+        if entry is not None:
+            self.hits += 1
+            self.resident.move_to_end(session_id)
+            return entry[0]
+        if session_id not in self.spilled:
+            return None
+        self.misses += 1
+        path = self.path(session_id)
+        with open(path, "rb") as f:
+            state = decode_state(f.read(), random.Random())
+        os.remove(path)
+        self.spilled.discard(session_id)
+        self.put(session_id, state)
+        return state
+
+    def put(self, session_id, state):
+        # Adds a farm, or re-measures one after it changed, and marks it most
+        # recently used
+        old = self.resident.pop(session_id, None)
+        if old is not None:
+            self.resident_bytes -= old[1]
+        self.unspillable.discard(session_id)
+        size = estimate_state_bytes(state)
+        self.resident[session_id] = (state, size)
+        self.resident_bytes += size
+        self.evict()
+
+    def pop(self, session_id):
+        entry = self.resident.pop(session_id, None)
+        if entry is not None:
+            self.resident_bytes -= entry[1]
+            self.unspillable.discard(session_id)
+        elif session_id in self.spilled:
+            self.spilled.discard(session_id)
+            os.remove(self.path(session_id))
+
+    def evict(self):
+        # Writes the least recently used farms to disk until the rest fit the
+        # budget. The most recently used farm always stays, even if it alone
+        # is over budget. A farm is only dropped from memory once its file is
+        # written; one that fails to encode is reported and kept.
+        if self.resident_bytes <= self.budget:
+            return
+        written = []
+        freed = 0
+        for session_id, (state, size) in itertools.islice(self.resident.items(), len(self.resident) - 1):
+            if self.resident_bytes - freed <= self.budget:
+                break
+            if session_id in self.unspillable:
+                continue
+            try:
+                self.spill(session_id, state)
+            except Exception as e:
+                self.unspillable.add(session_id)
+                self.failed_evictions += 1
+                print(f"sessionstore: keeping {session_id} in memory, could not write it: {e!r}", file=sys.stderr)
+                continue
+            written.append(session_id)
+            freed += size
+        for session_id in written:
+            _, size = self.resident.pop(session_id)
+            self.spilled.add(session_id)
+            self.resident_bytes -= size
+            self.evictions += 1
+
+    def spill(self, session_id, state):
+        data = encode_state(state)
+        path = self.path(session_id)
+        try:
+            with open(path, "wb") as f:
+                f.write(data)
+        except OSError:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+
+    def close(self):
+        # Forget every farm and clean up the spill files
+        for session_id in self.spilled:
+            os.remove(self.path(session_id))
+        self.spilled.clear()
+        self.resident.clear()
+        self.unspillable.clear()
+        self.resident_bytes = 0
+        if self.owns_directory:
+            os.rmdir(self.directory)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "resident": len(self.resident),
+            "spilled": len(self.spilled),
+            "resident_bytes": self.resident_bytes,
+            "budget": self.budget,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "failed_evictions": self.failed_evictions,
+            "hit_rate": self.hits / lookups if lookups else None,
+        }
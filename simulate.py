@@ -0,0 +1,97 @@
+"""Headless games for bots and balance studies.
+
+A policy is a function ``policy(state) -> action`` that is called repeatedly
+during a turn until it returns ``("end_turn",)``. ``run_game`` plays one full
+game under a policy with its own seeded random stream and reports the outcome.
+"""
+
+import importlib
+
+from main import (
+    CHICKEN_STATS, COOP_UPGRADES, GHOST_EXCHANGE_RATES, HATCHING_COST,
+    VICTORY_CASH, VICTORY_MEAT, new_game, apply_action, game_outcome,
+    get_chicken_price, get_feed_price, get_feed_needed
+)
+
+MAX_TURNS = 200
+MAX_ACTIONS_PER_TURN = 50
+# Policies by name, as (module, function) so the solver is only imported if
+# it is picked
+POLICIES = {
+    "greedy": ("simulate", "greedy_policy"),
+    "solver": ("solver", "solver_policy"),
+}
+
+def game_seed(seed, index):
+    # Independent, reproducible stream for game `index` of a run seeded with `seed`
+    return (seed << 32) | index
+
+def game_rng(seed):
+    # The random stream a headless game with this seed plays with. Imported
+    # here so the GUI can use the policies without NumPy installed.
+    from blockrng import BlockRNG
+    return BlockRNG(seed)
+
+def load_policy(name):
+    module, function = POLICIES[name]
+    return getattr(importlib.import_module(module), function)
+
+def greedy_policy(state):
+    # Collect ghosts, keep two turns of feed, grow the flock, then bank cash and
+    # harvest meat once the coop is full.
+    if any(state.graveyard[tier] >= rate for tier, rate in GHOST_EXCHANGE_RATES.items()):
+        return ("exchange_all_ghosts",)
+
+    if state.eggs > 0:
+        keep = HATCHING_COST if len(state.chickens) < state.get_coop_capacity() else 0
+        if state.eggs > keep:
+            return ("sell_eggs", state.eggs - keep)
+
+    feed_short = 2 * get_feed_needed(state) - state.feed
+    if feed_short > 0 and state.cash >= feed_short * get_feed_price(state):
+        return ("buy_feed", feed_short)
+
+    if len(state.chickens) < state.get_coop_capacity():
+        if state.eggs >= HATCHING_COST:
+            return ("hatch_eggs",)
+        for breed in reversed(list(CHICKEN_STATS)):
+            if state.cash >= get_chicken_price(state, breed) + 5:
+                return ("buy_chicken", breed)
+        return ("end_turn",)
+
+    next_level = state.coop_level + 1
+    if next_level in COOP_UPGRADES and state.cash >= COOP_UPGRADES[next_level]["cost"] + 10:
+        return ("upgrade_coop",)
+
+    if state.banked_cash < VICTORY_CASH and state.cash >= 10:
+        return ("bank_cash", int(state.cash) - 5)
+
+    if state.season == "Fall" and state.meat_harvested_this_year < VICTORY_MEAT and len(state.chickens) > 2:
+        weakest = min(range(len(state.chickens)), key=lambda i: state.chickens[i].eggs_per_turn)
+        return ("harvest_chicken", weakest)
+
+    return ("end_turn",)
+
+def run_game(seed, policy=greedy_policy, max_turns=MAX_TURNS, record=False):
+    # Returns {"outcome": "win" | "bankrupt" | "timeout", "turns": n}. With
+    # record=True, "trajectory" holds (cash, feed, eggs, meat, flock) at the
+    # start of every turn.
+    state, _ = new_game(game_rng(seed))
+    trajectory = []
+    outcome = None
+    for _ in range(max_turns):
+        if record:
+            trajectory.append((state.cash, state.feed, state.eggs, state.meat, len(state.chickens)))
+        outcome = game_outcome(state)
+        if outcome:
+            break
+        for _ in range(MAX_ACTIONS_PER_TURN):
+            action = policy(state)
+            if action[0] == "end_turn":
+                break
+            apply_action(state, action)
+        apply_action(state, ("end_turn",))
+    result = {"outcome": outcome or "timeout", "turns": state.turn}
+    if record:
+        result["trajectory"] = trajectory
+    return result
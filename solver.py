@@ -0,0 +1,267 @@
+"""Expectimax solver for Poultry Geist.
+
+``Solver.solve(state)`` searches the real rules from ``state`` and returns the
+best action it found. Player choices are max nodes. The random rolls - the
+event roll and event choice at the start of a turn, winter illness and hatch
+success - are chance nodes expanded with their exact probabilities by feeding
+the engine a scripted rng. Positions are hashed canonically into a bounded
+transposition table so transpositions are searched once.
+
+Search runs by iterative deepening over the number of turns ahead until the
+node or time budget runs out, and the answer comes from the deepest horizon
+that finished.
+"""
+
+import time
+from collections import OrderedDict
+
+from main import (
+    CHICKEN_STATS, COOP_UPGRADES, EVENT_CHANCE, GHOST_EXCHANGE_RATES,
+    HATCHING_COST, RULES, TURNS_PER_SEASON, VICTORY_CASH, VICTORY_EGGS,
+    VICTORY_MEAT, GameState, apply_action, is_bankrupt, is_victory,
+    get_chicken_price, get_feed_needed, get_feed_price, get_hatch_rate,
+    get_usable_ghosts
+)
+
+WIN_VALUE = 1000.0
+LOSS_VALUE = -1000.0
+# Values a scripted rng hands out to force a roll to pass or fail
+ROLL_PASS = 0.0
+ROLL_FAIL = 1.0 - 2 ** -53
+
+
+class ScriptedRNG:
+    # Stands in for GameState.rng: returns pre-chosen rolls in draw order
+    __slots__ = ("rolls",)
+
+    def __init__(self, rolls):
+        self.rolls = list(reversed(rolls))
+
+    def random(self):
+        return self.rolls.pop()
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+def canonical_key(state):
+    # Order of birds and ghosts is dropped, along with values that never
+    # influence the rest of the game (lifetime meat, year, eggs already counted)
+    flock = {}
+    for chicken in state.chickens:
+        key = (chicken.breed, chicken.purchase_price)
+        flock[key] = flock.get(key, 0) + 1
+    return (
+        state.cash, state.banked_cash, state.feed, state.eggs,
+        state.meat_harvested_this_year, state.coop_level, state.double_eggs_active,
+        state.egg_price_multiplier, state.season_index, (state.turn - 1) % TURNS_PER_SEASON,
+        tuple(sorted(flock.items())),
+        tuple(state.ghost_counts.values()), tuple(state.graveyard.values()),
+    )
+
+
+def evaluate(state):
+    # Leaf heuristic: progress towards each victory goal plus a small weight on
+    # assets that turn into progress later
+    bronze_bonus = state.ghost_counts["Bronze"]
+    egg_rate = sum(c.eggs_per_turn + (bronze_bonus if c.tier == "Bronze" else 0) for c in state.chickens)
+    progress = (min(state.banked_cash, VICTORY_CASH) / VICTORY_CASH
+                + min(state.meat_harvested_this_year, VICTORY_MEAT) / VICTORY_MEAT
+                + min(egg_rate, VICTORY_EGGS) / VICTORY_EGGS)
+    assets = state.cash + state.eggs + state.feed / 2 + sum(c.get_sale_price(state.season) for c in state.chickens)
+    return progress + assets / 200
+
+
+def next_season_index(state):
+    # Season the next turn starts in; next_turn rolls over after the last
+    # turn of a season
+    if state.turn % TURNS_PER_SEASON == 0:
+        return (state.season_index + 1) % len(RULES.season_names)
+    return state.season_index
+
+
+def illness_outcomes(state):
+    # (probability, scripted rolls) for the illness roll at the end of this turn
+    chance = RULES.season_illness_chance[state.season_index]
+    if not chance:
+        return [(1.0, ())]
+    return [(chance, (ROLL_PASS,)), (1 - chance, (ROLL_FAIL,))]
+
+
+def event_outcomes(season_index):
+    # (probability, scripted rolls) for the event roll at the start of a turn
+    # in `season_index`
+    weights = RULES.season_event_weights[season_index]
+    total = sum(weights)
+    if not total:
+        return [(1.0, (ROLL_FAIL,))]
+    events = [(1 - EVENT_CHANCE, (ROLL_FAIL,))]
+    for i, weight in enumerate(weights):
+        if weight > 0:
+            roll = RULES.event_roll(season_index, i)
+            events.append((EVENT_CHANCE * weight / total, (ROLL_PASS, roll)))
+    return events
+
+
+def end_turn_outcomes(state):
+    # (probability, scripted rolls) for every way end_turn can resolve. The
+    # illness roll belongs to this turn's season and the event roll to the
+    # next turn's, which differ on the last turn of a season.
+    illness = illness_outcomes(state)
+    events = event_outcomes(next_season_index(state))
+    return [(p_ill * p_ev, ill + ev) for p_ill, ill in illness for p_ev, ev in events]
+
+
+def candidate_actions(state):
+    actions = [("end_turn",)]
+    if state.eggs > 0:
+        actions.append(("sell_eggs", state.eggs))
+    if state.eggs >= HATCHING_COST and len(state.chickens) < state.get_coop_capacity():
+        actions.append(("hatch_eggs",))
+    feed_short = get_feed_needed(state) - state.feed
+    if feed_short > 0 and state.cash >= feed_short * get_feed_price(state):
+        actions.append(("buy_feed", feed_short))
+    if len(state.chickens) < state.get_coop_capacity():
+        for breed in CHICKEN_STATS:
+            if state.cash >= get_chicken_price(state, breed):
+                actions.append(("buy_chicken", breed))
+    seen = set()
+    for i, chicken in enumerate(state.chickens):
+        if (chicken.breed, chicken.purchase_price) not in seen:
+            seen.add((chicken.breed, chicken.purchase_price))
+            actions.append(("sell_chicken", i))
+            actions.append(("harvest_chicken", i))
+    if int(state.cash) > 0 and state.banked_cash < VICTORY_CASH:
+        actions.append(("bank_cash", int(state.cash)))
+    next_level = state.coop_level + 1
+    if next_level in COOP_UPGRADES and state.cash >= COOP_UPGRADES[next_level]["cost"]:
+        actions.append(("upgrade_coop",))
+    if any(state.graveyard[t] >= r for t, r in GHOST_EXCHANGE_RATES.items()):
+        actions.append(("exchange_all_ghosts",))
+    for tier in ("Silver", "Gold"):
+        usable = get_usable_ghosts(state)
+        for i, ghost in enumerate(usable):
+            if ghost.original_tier == tier:
+                actions.append(("use_ghost_ability", i, 0))
+                break
+    return actions
+
+
+class Solver:
+    def __init__(self, max_horizon=3, actions_per_turn=2, node_budget=None, time_budget=1.0, table_size=200000):
+        self.max_horizon = max_horizon
+        self.actions_per_turn = actions_per_turn
+        self.node_budget = node_budget
+        self.time_budget = time_budget
+        self.table_size = table_size
+        self.table = OrderedDict()
+        self.nodes = 0
+        self.table_hits = 0
+        self._deadline = None
+
+    def solve(self, state):
+        start = time.perf_counter()
+        self._deadline = start + self.time_budget if self.time_budget else None
+        self.nodes = 0
+        self.table_hits = 0
+        best_action, best_value, depth = ("end_turn",), None, 0
+        for horizon in range(1, self.max_horizon + 1):
+            try:
+                best_value, best_action = self._decide(state.snapshot(), horizon, self.actions_per_turn, root=True)
+                depth = horizon
+            except BudgetExceeded:
+                break
+        elapsed = time.perf_counter() - start
+        return {
+            "action": best_action,
+            "value": best_value,
+            "depth": depth,
+            "nodes": self.nodes,
+            "table_hits": self.table_hits,
+            "table_entries": len(self.table),
+            "elapsed": elapsed,
+            "nodes_per_sec": self.nodes / elapsed if elapsed else 0.0,
+        }
+
+    def _visit(self):
+        self.nodes += 1
+        if self.node_budget is not None and self.nodes > self.node_budget:
+            raise BudgetExceeded
+        if self._deadline is not None and self.nodes % 256 == 0 and time.perf_counter() > self._deadline:
+            raise BudgetExceeded
+
+    def _child(self, snapshot, action, rolls=()):
+        child = GameState.from_snapshot(snapshot, ScriptedRNG(rolls))
+        apply_action(child, action)
+        return child
+
+    def _decide(self, snapshot, turns_left, actions_left, root=False):
+        self._visit()
+        state = GameState.from_snapshot(snapshot)
+        if is_bankrupt(state):
+            return LOSS_VALUE, None
+        key = (canonical_key(state), turns_left, actions_left)
+        if not root and key in self.table:
+            self.table.move_to_end(key)
+            self.table_hits += 1
+            return self.table[key], None
+
+        best_value, best_action = None, None
+        actions = candidate_actions(state) if actions_left > 0 else [("end_turn",)]
+        for action in actions:
+            value = self._action_value(state, snapshot, action, turns_left, actions_left)
+            if value is not None and (best_value is None or value > best_value):
+                best_value, best_action = value, action
+
+        self.table[key] = best_value
+        if len(self.table) > self.table_size:
+            self.table.popitem(last=False)
+        return best_value, best_action
+
+    def _action_value(self, state, snapshot, action, turns_left, actions_left):
+        if action[0] == "end_turn":
+            # Different rolls often land on the same position (Coldsnap and
+            # Predation, an event that changes nothing), so merge them first
+            children = {}
+            for probability, rolls in end_turn_outcomes(state):
+                child = self._child(snapshot, action, rolls)
+                key = (canonical_key(child), child.eggs_this_turn)
+                if key in children:
+                    children[key][0] += probability
+                else:
+                    children[key] = [probability, child]
+            value = 0.0
+            for probability, child in children.values():
+                if is_victory(child, child.eggs_this_turn):
+                    outcome = WIN_VALUE + turns_left
+                elif turns_left == 1:
+                    self._visit()
+                    outcome = LOSS_VALUE if is_bankrupt(child) else evaluate(child)
+                else:
+                    outcome, _ = self._decide(child.snapshot(), turns_left - 1, self.actions_per_turn)
+                value += probability * outcome
+            return value
+
+        if action[0] == "hatch_eggs":
+            rate = get_hatch_rate(state)
+            outcomes = [(rate, (ROLL_PASS,)), (1 - rate, (ROLL_FAIL,))]
+        else:
+            outcomes = [(1.0, ())]
+        value = 0.0
+        for probability, rolls in outcomes:
+            child = self._child(snapshot, action, rolls).snapshot()
+            if child == snapshot:
+                return None  # the action was refused; nothing to search
+            outcome, _ = self._decide(child, turns_left, actions_left - 1)
+            value += probability * outcome
+        return value
+
+
+def best_action(state, **solver_options):
+    return Solver(**solver_options).solve(state)["action"]
+
+
+def solver_policy(state):
+    # Policy for simulate.run_game; a short search per decision
+    return Solver(max_horizon=2, actions_per_turn=2, time_budget=0.2).solve(state)["action"]
@@ -0,0 +1,100 @@
+"""Startup profiling for the console game and the GUI.
+
+Set POULTRYGEIST_PROFILE_STARTUP=1 to have the game report, once its first
+screen is up, how long that took against STARTUP_BUDGET_MS and which imports
+the time went to. Set it to a file path instead to get the report as JSON.
+
+The entry scripts import this module before anything else. It times every
+import made after that by wrapping ``builtins.__import__``, and only while
+profiling is switched on; otherwise importing it does nothing.
+"""
+
+import builtins
+import os
+import sys
+import time
+
+PROFILE_ENV_VAR = "POULTRYGEIST_PROFILE_STARTUP"
+# Time-to-first-screen target for cold starts on the kiosk machines
+STARTUP_BUDGET_MS = 300
+# Imports listed in the text report
+REPORT_IMPORTS = 15
+
+
+class StartupProfiler:
+    def __init__(self, destination):
+        self.destination = destination
+        self.start = time.perf_counter()
+        self.imports = []  # (module, depth, cumulative seconds, self seconds) in completion order
+        self.stack = []  # seconds spent in nested imports, per open import
+        self.original_import = builtins.__import__
+        builtins.__import__ = self._import
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Submodules named in a from-import (from tkinter import ttk) load
+        # inside this call too
+        new = [name] if level == 0 and name not in sys.modules else []
+        if fromlist and level == 0:
+            new += [f"{name}.{item}" for item in fromlist if f"{name}.{item}" not in sys.modules]
+        if not new:
+            return self.original_import(name, globals, locals, fromlist, level)
+        started = time.perf_counter()
+        self.stack.append(0.0)
+        try:
+            return self.original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            nested = self.stack.pop()
+            if self.stack:
+                self.stack[-1] += elapsed
+            loaded = [module for module in new if module in sys.modules] or new[:1]
+            self.imports.append((", ".join(loaded), len(self.stack), elapsed, elapsed - nested))
+
+    def report(self, screen):
+        builtins.__import__ = self.original_import
+        elapsed_ms = (time.perf_counter() - self.start) * 1000
+        top_level = [record for record in self.imports if record[1] == 0]
+        result = {
+            "screen": screen,
+            "first_screen_ms": elapsed_ms,
+            "budget_ms": STARTUP_BUDGET_MS,
+            "within_budget": elapsed_ms <= STARTUP_BUDGET_MS,
+            "import_ms": sum(record[2] for record in top_level) * 1000,
+            "imports": [
+                {"module": module, "depth": depth, "cumulative_ms": cumulative * 1000, "self_ms": own * 1000}
+                for module, depth, cumulative, own in self.imports
+            ],
+        }
+        if self.destination == "1":
+            print(format_report(result), file=sys.stderr)
+        else:
+            import json
+            with open(self.destination, "w") as f:
+                json.dump(result, f, indent=2)
+        return result
+
+
+def format_report(result):
+    verdict = "within budget" if result["within_budget"] else "OVER BUDGET"
+    lines = [
+        "--- Startup profile ---",
+        f"First screen ({result['screen']}) after {result['first_screen_ms']:.1f} ms; "
+        f"budget {result['budget_ms']} ms, {verdict}",
+        f"Imports: {result['import_ms']:.1f} ms",
+        f"{'cumulative':>12} {'self':>9}  module",
+    ]
+    slowest = sorted(result["imports"], key=lambda r: r["cumulative_ms"], reverse=True)[:REPORT_IMPORTS]
+    for record in slowest:
+        lines.append(f"{record['cumulative_ms']:9.1f} ms {record['self_ms']:6.1f} ms  {record['module']}")
+    return "\n".join(lines)
+
+
+PROFILER = StartupProfiler(os.environ[PROFILE_ENV_VAR]) if os.environ.get(PROFILE_ENV_VAR) else None
+
+def first_screen(screen):
+    # Called by the front-ends once their first screen is showing; reports
+    # the first time only
+    global PROFILER
+    if PROFILER is not None:
+        profiler, PROFILER = PROFILER, None
+        profiler.report(screen)
@@ -0,0 +1,264 @@
+"""Balance sweeps: simulate games under many variations of the rules.
+
+A search space is a JSON object mapping dotted paths into rules.json to the
+values to try. A list is a set of choices; {"min": a, "max": b} is a range,
+sampled uniformly in random search (as integers when both ends are
+integers) and split into "steps" points in grid search:
+
+    {
+        "hatching_success_rate": [0.4, 0.5, 0.6],
+        "event_chance": {"min": 0.1, "max": 0.4, "steps": 4},
+        "coop_upgrades.2.cost": [40, 50, 60],
+        "ghost_exchange_rates.Bronze": [2, 3],
+        "victory.eggs": {"min": 15, "max": 30}
+    }
+
+Every config plays the same seeded games under a policy, spread over a
+process pool, and is reported with its win rate, median turns to win and
+bankruptcy rate. Results are cached on disk under a hash of the ruleset, the
+policy and the seed range, so re-running a sweep only simulates the configs
+that changed:
+
+    python sweep.py space.json --games 2000 --workers 8
+    python sweep.py space.json --random 50 --games 2000
+"""
+
+import argparse
+import copy
+import hashlib
+import itertools
+import json
+import os
+import random
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import main as engine
+from rules import Ruleset
+from simulate import MAX_TURNS, POLICIES, run_game, game_seed, load_policy
+
+CHUNK_SIZE = 250
+DEFAULT_CACHE_DIR = ".sweep-cache"
+# Policies copy rule constants with "from main import ...", so use_rules
+# updates these modules along with main.py
+RULE_CONSTANTS = (
+    "INITIAL_CASH", "INITIAL_FEED", "INITIAL_CHICKENS", "TURNS_PER_SEASON", "EVENT_CHANCE",
+    "HATCHING_COST", "HATCHING_SUCCESS_RATE", "COOP_UPGRADES", "VICTORY_EGGS", "VICTORY_CASH",
+    "VICTORY_MEAT", "GHOST_EXCHANGE_RATES", "CHICKEN_STATS", "SEASONS", "EVENTS", "RULES",
+)
+RULE_MODULES = ("simulate", "solver")
+
+
+class SearchSpaceError(Exception):
+    pass
+
+
+# --- Search spaces ---
+
+def grid_values(name, spec):
+    if isinstance(spec, list):
+        return spec
+    if "steps" not in spec:
+        raise SearchSpaceError(f"{name}: a range needs \"steps\" for a grid search")
+    low, high, steps = spec["min"], spec["max"], spec["steps"]
+    if steps == 1:
+        return [low]
+    values = [low + (high - low) * i / (steps - 1) for i in range(steps)]
+    if isinstance(low, int) and isinstance(high, int):
+        values = sorted(set(round(v) for v in values))
+    return values
+
+def sample_value(spec, rng):
+    if isinstance(spec, list):
+        return rng.choice(spec)
+    low, high = spec["min"], spec["max"]
+    if isinstance(low, int) and isinstance(high, int):
+        return rng.randint(low, high)
+    return rng.uniform(low, high)
+
+def grid_configs(space):
+    names = list(space)
+    for values in itertools.product(*(grid_values(name, space[name]) for name in names)):
+        yield dict(zip(names, values))
+
+def random_configs(space, count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield {name: sample_value(spec, rng) for name, spec in space.items()}
+
+def apply_config(data, config):
+    # A copy of the rules data with each dotted path set to its value
+    data = copy.deepcopy(data)
+    for path, value in config.items():
+        *parents, leaf = path.split(".")
+        node = data
+        try:
+            for key in parents:
+                node = node[key]
+            if leaf not in node:
+                raise KeyError(leaf)
+        except (KeyError, TypeError):
+            raise SearchSpaceError(f"{path} is not a value in the rules") from None
+        node[leaf] = value
+    return data
+
+
+# --- Running configs ---
+
+def use_rules(ruleset):
+    engine.use_ruleset(ruleset)
+    for name in RULE_MODULES:
+        module = sys.modules.get(name)
+        if module is None:
+            continue
+        for constant in RULE_CONSTANTS:
+            if hasattr(module, constant):
+                setattr(module, constant, getattr(engine, constant))
+
+def run_chunk(data, policy, seed, start, stop, max_turns=MAX_TURNS):
+    # Plays games start..stop under the rules in `data`; returns outcome and
+    # turns-to-win counts
+    use_rules(Ruleset(data))
+    policy_fn = load_policy(policy)
+    outcomes, turns_to_win = Counter(), Counter()
+    for index in range(start, stop):
+        result = run_game(game_seed(seed, index), policy_fn, max_turns)
+        outcomes[result["outcome"]] += 1
+        if result["outcome"] == "win":
+            turns_to_win[result["turns"]] += 1
+    return outcomes, turns_to_win
+
+def median(counts):
+    total = sum(counts.values())
+    if not total:
+        return None
+    seen = 0
+    for value in sorted(counts):
+        seen += counts[value]
+        if 2 * seen >= total:
+            return value
+
+def positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+def summarize(outcomes, turns_to_win):
+    games = sum(outcomes.values())
+    return {
+        "games": games,
+        "win_rate": outcomes["win"] / games,
+        "bankruptcy_rate": outcomes["bankrupt"] / games,
+        "timeout_rate": outcomes["timeout"] / games,
+        "median_turns_to_win": median(turns_to_win),
+    }
+
+def cache_key(ruleset, policy, seed, games, max_turns):
+    text = f"{ruleset.fingerprint()}|{policy}|{seed}|{games}|{max_turns}"
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class ResultCache:
+    # One JSON file per finished config
+    def __init__(self, directory=DEFAULT_CACHE_DIR):
+        self.directory = directory
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        try:
+            with open(self.path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, result):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.path(key) + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(result, f)
+        os.replace(tmp_path, self.path(key))
+
+
+def run_sweep(configs, base_data, games, seed=0, policy="greedy", max_turns=MAX_TURNS,
+              workers=None, cache=None, chunk_size=CHUNK_SIZE):
+    # Returns one result per config, in order. Cached configs are not re-run.
+    if games < 1:
+        raise ValueError(f"games must be at least 1, got {games}")
+    results = []
+    pending = []  # (result, key, data) still to simulate
+    for config in configs:
+        data = apply_config(base_data, config)
+        ruleset = Ruleset(data)
+        key = cache_key(ruleset, policy, seed, games, max_turns)
+        result = {"config": config, "rules": ruleset.fingerprint()}
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None:
+            result.update(cached, cached=True)
+        else:
+            pending.append((result, key, data))
+        results.append(result)
+
+    chunks = [(start, min(start + chunk_size, games)) for start in range(0, games, chunk_size)]
+    tasks = [(data, policy, seed, start, stop, max_turns) for _, _, data in pending for start, stop in chunks]
+    if workers == 1:
+        rules = engine.RULES
+        try:
+            partials = [run_chunk(*task) for task in tasks]
+        finally:
+            use_rules(rules)  # the chunks swapped the rules in this process
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_chunk, *task) for task in tasks]
+            partials = [future.result() for future in futures]
+
+    for i, (result, key, _) in enumerate(pending):
+        outcomes, turns_to_win = Counter(), Counter()
+        for chunk_outcomes, chunk_turns in partials[i * len(chunks):(i + 1) * len(chunks)]:
+            outcomes.update(chunk_outcomes)
+            turns_to_win.update(chunk_turns)
+        summary = summarize(outcomes, turns_to_win)
+        if cache is not None:
+            cache.put(key, summary)
+        result.update(summary, cached=False)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep Poultry Geist balance values over simulated games.")
+    parser.add_argument("space", help="JSON search space: dotted rules.json paths to lists or ranges")
+    parser.add_argument("--random", type=int, metavar="N", help="sample N configs instead of the full grid")
+    parser.add_argument("--search-seed", type=int, default=0, help="seed for --random sampling")
+    parser.add_argument("--games", type=positive_int, default=1000, help="games per config")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--max-turns", type=int, default=MAX_TURNS)
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    with open(args.space) as f:
+        space = json.load(f)
+    try:
+        if args.random:
+            configs = list(random_configs(space, args.random, args.search_seed))
+        else:
+            configs = list(grid_configs(space))
+        results = run_sweep(configs, engine.RULES.data, args.games, args.seed, args.policy, args.max_turns,
+                            args.workers, None if args.no_cache else ResultCache(args.cache_dir))
+    except SearchSpaceError as e:
+        parser.error(str(e))
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()